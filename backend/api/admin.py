@@ -64,8 +64,8 @@ import json
 import csv
 import io
 
-from dependencies import get_current_admin_user
-import database
+from backend.dependencies import get_current_admin_user
+from backend import database
 
 logger = logging.getLogger("uvicorn")
 router = APIRouter(prefix="/api/v1/admin", tags=["Admin"])
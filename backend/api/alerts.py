@@ -54,6 +54,7 @@ Rate Limit: 100 requests/minute
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from fastapi.responses import StreamingResponse
+from psycopg.types.json import Jsonb
 from psycopg_pool import AsyncConnectionPool
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
@@ -64,9 +65,9 @@ import csv
 import io
 
 # Imports locais
-from database import get_db_pool
+from backend.database import get_db_pool
 from models.alerts import AlertCreate, AlertUpdate, AlertResponse
-from dependencies import get_current_user, limiter
+from backend.dependencies import get_current_user, limiter
 from fastapi import Request
 
 
@@ -262,7 +263,7 @@ async def create_alert(
                         alert.snapshot_path,
                         alert.video_path,
                         alert.email_sent,
-                        json.dumps(alert.metadata or {})
+                        Jsonb(alert.metadata or {})
                     )
                 )
                 row = await cur.fetchone()
@@ -519,7 +520,7 @@ async def update_alert(
                 
                 # Serializa metadata para JSON
                 if key == 'metadata' and isinstance(value, dict):
-                    value = json.dumps(value)
+                    value = Jsonb(value)
                 
                 update_fields.append(f"{key} = %s")
                 params.append(value)
@@ -39,14 +39,14 @@ import logging
 
 # ✅ v1.0 imports
 from models.auth import UserCreate, UserLogin, Token, UserResponse
-from dependencies import (
+from backend.dependencies import (
     authenticate_user,
     create_access_token,
-    get_password_hash,
+    get_password_hash_async,
     get_current_active_user,
     limiter
 )
-import database
+from backend import database
 from config import settings
 
 # ➕ NEW v3.0 imports
@@ -181,7 +181,7 @@ async def register(
         )
     
     # ✅ v1.0: Hash da senha
-    password_hash = get_password_hash(user.password)
+    password_hash = await get_password_hash_async(user.password)
     
     # ✅ v1.0: Cria usuário (primeiro usuário é admin)
     all_users = await database.get_all_users()
@@ -591,7 +591,7 @@ async def confirm_password_reset(
             )
         
         # Hash and update password
-        new_password_hash = get_password_hash(reset_confirm.new_password)
+        new_password_hash = await get_password_hash_async(reset_confirm.new_password)
         success = await database.update_user_password(user["id"], new_password_hash)
         
         if not success:
@@ -655,7 +655,7 @@ async def change_password(
         )
     
     # Hash and update password
-    new_password_hash = get_password_hash(password_change.new_password)
+    new_password_hash = await get_password_hash_async(password_change.new_password)
     success = await database.update_user_password(current_user["id"], new_password_hash)
     
     if not success:
@@ -61,8 +61,8 @@ import logging
 import json
 import io
 
-from dependencies import get_current_admin_user, get_current_active_user
-import database
+from backend.dependencies import get_current_admin_user, get_current_active_user
+from backend import database
 
 logger = logging.getLogger("uvicorn")
 router = APIRouter(prefix="/api/v1/settings", tags=["Settings"])
@@ -670,15 +670,9 @@ async def update_settings(
     **Requer:** Token JWT de admin
     """
     try:
-        updated_count = 0
-        
-        for key, value in settings_data.settings.items():
-            await database.set_setting(
-                key=key,
-                value=value,
-                updated_by=current_user["username"]
-            )
-            updated_count += 1
+        updated_count = await database.set_settings_bulk(
+            settings_data.settings, updated_by=current_user["username"]
+        )
         
         await database.log_system_action(
             action="settings_updated",
@@ -787,11 +781,7 @@ async def get_yolo_config(
         }
         
         # Safe zone (JSON)
-        raw_safe_zone = await database.get_setting("safe_zone", "[]")
-        try:
-            config["safe_zone"] = json.loads(raw_safe_zone) if isinstance(raw_safe_zone, str) else raw_safe_zone
-        except:
-            config["safe_zone"] = []
+        config["safe_zone"] = await database.get_setting_json("safe_zone", [])
         
         logger.info(f"🎯 Config YOLO obtida")
         
@@ -837,18 +827,21 @@ async def update_yolo_config(
             "zone_full_threshold": ("zone_full_threshold", str),
         }
         
+        updates = {}
         for field, (setting_key, converter) in field_mapping.items():
             value = getattr(update, field, None)
             if value is not None:
-                await database.set_setting(setting_key, converter(value), updated_by=current_user["username"])
+                updates[setting_key] = converter(value)
                 updated_fields.append(setting_key)
         
         # Safe zone (JSON)
         if update.safe_zone is not None:
             safe_zone_json = json.dumps(update.safe_zone) if isinstance(update.safe_zone, (list, dict)) else str(update.safe_zone)
-            await database.set_setting("safe_zone", safe_zone_json, updated_by=current_user["username"])
+            updates["safe_zone"] = safe_zone_json
             updated_fields.append("safe_zone")
         
+        await database.set_settings_bulk(updates, updated_by=current_user["username"])
+        
         await database.log_system_action(
             action="yolo_config_updated",
             username=current_user["username"],
@@ -1057,12 +1050,7 @@ async def reset_settings(
     try:
         default_settings = await get_default_settings()
         
-        for key, value in default_settings.items():
-            await database.set_setting(
-                key=key,
-                value=value,
-                updated_by=current_user["username"]
-            )
+        await database.set_settings_bulk(default_settings, updated_by=current_user["username"])
         
         await database.log_system_action(
             action="settings_reset",
@@ -1340,10 +1328,9 @@ async def import_settings(
                 }
         
         # Import settings
-        imported_count = 0
-        for key, value in settings_to_import.items():
-            await database.set_setting(key, str(value), updated_by=current_user["username"])
-            imported_count += 1
+        imported_count = await database.set_settings_bulk(
+            settings_to_import, updated_by=current_user["username"]
+        )
         
         # Log
         await database.log_system_action(
@@ -1401,11 +1388,13 @@ async def bulk_update_settings(
                 }
         
         # Update all
-        updated_count = 0
-        for operation in bulk_request.operations:
-            value_str = json.dumps(operation.value) if isinstance(operation.value, (dict, list)) else str(operation.value)
-            await database.set_setting(operation.key, value_str, updated_by=current_user["username"])
-            updated_count += 1
+        updated_count = await database.set_settings_bulk(
+            {
+                operation.key: json.dumps(operation.value) if isinstance(operation.value, (dict, list)) else str(operation.value)
+                for operation in bulk_request.operations
+            },
+            updated_by=current_user["username"]
+        )
         
         # Log
         await database.log_system_action(
@@ -52,6 +52,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Request, Query, U
 from fastapi.responses import StreamingResponse, JSONResponse
 from pydantic import BaseModel, Field, EmailStr, validator
 from typing import List, Optional, Dict, Any
+from contextlib import aclosing
 from datetime import datetime, timedelta
 from enum import Enum
 import logging
@@ -60,8 +61,8 @@ import csv
 import io
 
 from models.auth import UserResponse, UserCreate, UserUpdate
-from dependencies import get_current_admin_user, get_current_active_user, get_password_hash
-import database
+from backend.dependencies import get_current_admin_user, get_current_active_user, get_password_hash_async
+from backend import database
 
 logger = logging.getLogger("uvicorn")
 router = APIRouter(prefix="/api/v1/users", tags=["Users"])
@@ -312,21 +313,21 @@ async def export_users(
                 detail=f"Invalid format '{format}'. Use 'json' or 'csv'"
             )
         
-        users = await database.get_all_users()
-        logger.info(f"📊 Retrieved {len(users)} users for export")
-        
-        # Remove sensitive data
+        # Remove sensitive data (✅ streaming: sem lista completa de usuários em memória)
         export_users = []
-        for user in users:
-            export_user = {
-                "id": user.get("id"),
-                "username": user.get("username"),
-                "email": user.get("email"),
-                "role": user.get("role"),
-                "is_active": user.get("is_active"),
-                "created_at": user.get("created_at")
-            }
-            export_users.append(export_user)
+        # aclosing: se a iteração for interrompida, o cursor e a conexão voltam ao pool na hora
+        async with aclosing(database.iter_all_users()) as users:
+            async for user in users:
+                export_user = {
+                    "id": user.get("id"),
+                    "username": user.get("username"),
+                    "email": user.get("email"),
+                    "role": user.get("role"),
+                    "is_active": user.get("is_active"),
+                    "created_at": user.get("created_at")
+                }
+                export_users.append(export_user)
+        logger.info(f"📊 Retrieved {len(export_users)} users for export")
         
         if format == "json":
             export_data = {
@@ -425,7 +426,7 @@ async def create_user(
             )
         
         # Hash da senha
-        password_hash = get_password_hash(user.password)
+        password_hash = await get_password_hash_async(user.password)
         
         # Cria usuário
         success = await database.create_user(
@@ -696,7 +697,7 @@ async def bulk_create_users(
                     continue
                 
                 # Create user
-                password_hash = get_password_hash(user_data.password)
+                password_hash = await get_password_hash_async(user_data.password)
                 success = await database.create_user(
                     username=user_data.username,
                     email=user_data.email,
@@ -912,7 +913,7 @@ async def update_user_complete(
         
         if user_update.password:
             logger.info(f"🔑 Updating password for user ID {user_id}")
-            update_data["password_hash"] = get_password_hash(user_update.password)
+            update_data["password_hash"] = await get_password_hash_async(user_update.password)
         
         # ========================================================================
         # 📝 ATUALIZAR NO BANCO DE DADOS
@@ -971,7 +972,7 @@ async def reset_user_password(
         user = await validate_user_exists(user_id)
         
         # Hash new password
-        password_hash = get_password_hash(password_reset.new_password)
+        password_hash = await get_password_hash_async(password_reset.new_password)
         
         # ✅ CORRIGIDO: Usar update_user() ao invés da função inexistente
         success = await database.update_user(user_id, password_hash=password_hash)
@@ -1085,7 +1086,7 @@ async def reset_user_password_duplicate_disabled(
         user = await validate_user_exists(user_id)
         
         # Hash new password
-        password_hash = get_password_hash(password_reset.new_password)
+        password_hash = await get_password_hash_async(password_reset.new_password)
         
         # TODO: Update password in database
         await database.update_user_password(user_id, password_hash)
@@ -1405,7 +1406,7 @@ async def import_users(
                 
                 # Create with default password
                 default_password = "ChangeMe123!"
-                password_hash = get_password_hash(default_password)
+                password_hash = await get_password_hash_async(default_password)
                 
                 success = await database.create_user(
                     username=username,
@@ -74,8 +74,8 @@ from pydantic import BaseModel, Field, validator
 from psycopg_pool import AsyncConnectionPool
 
 from config import settings
-from database import get_db_pool
-from dependencies import get_current_user, get_current_admin_user, limiter
+from backend.database import get_db_pool
+from backend.dependencies import get_current_user, get_current_admin_user, limiter
 
 # Try to import YOLO detector
 try:
@@ -65,11 +65,12 @@ from fastapi import APIRouter, Depends, HTTPException, status, Request, Query, U
 from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field, validator
 from psycopg_pool import AsyncConnectionPool
+from psycopg.types.json import Jsonb
 
-from database import get_db_pool, sync_zones_to_settings
+from backend.database import get_db_pool, sync_zones_to_settings, schedule_zone_sync
 from models.zones import ZoneCreate, ZoneUpdate, ZoneResponse
 from config import settings
-from dependencies import get_current_admin_user, limiter
+from backend.dependencies import get_current_admin_user, limiter
 
 # ============================================================================
 # CONFIGURAÇÃO
@@ -339,7 +340,7 @@ async def zone_to_dict(row: dict) -> dict:
     return {
         'id': row['id'],
         'name': row['name'],
-        'points': json.loads(row['points']) if isinstance(row['points'], str) else row['points'],
+        'points': row['points'],
         'mode': row['mode'],
         'empty_timeout': row['empty_timeout'],
         'full_timeout': row['full_timeout'],
@@ -430,41 +431,41 @@ async def create_zone(
                         detail=f"Zona com nome '{zone.name}' já existe"
                     )
                 
-                # Insert zone
-                await cur.execute(
-                    """
-                    INSERT INTO zones (
-                        name, points, mode, empty_timeout, full_timeout,
-                        empty_threshold, full_threshold, enabled, active, created_at
-                    )
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, NOW())
-                    RETURNING id, name, points, mode, empty_timeout, full_timeout,
-                              empty_threshold, full_threshold, enabled, active, 
-                              created_at, updated_at
-                    """,
-                    (
-                        zone.name,
-                        json.dumps(zone.points),
-                        zone.mode,
-                        zone.empty_timeout,
-                        zone.full_timeout,
-                        zone.empty_threshold,
-                        zone.full_threshold,
-                        zone.enabled,
-                        zone.active
+                # Insert zone + sync do safe_zone + COMMIT em um único flush
+                async with conn.pipeline():
+                    await cur.execute(
+                        """
+                        INSERT INTO zones (
+                            name, points, mode, empty_timeout, full_timeout,
+                            empty_threshold, full_threshold, enabled, active, created_at
+                        )
+                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, NOW())
+                        RETURNING id, name, points, mode, empty_timeout, full_timeout,
+                                  empty_threshold, full_threshold, enabled, active, 
+                                  created_at, updated_at
+                        """,
+                        (
+                            zone.name,
+                            Jsonb(zone.points),
+                            zone.mode,
+                            zone.empty_timeout,
+                            zone.full_timeout,
+                            zone.empty_threshold,
+                            zone.full_threshold,
+                            zone.enabled,
+                            zone.active
+                        )
                     )
-                )
+                    await sync_zones_to_settings(conn)
                 
                 row = await cur.fetchone()
-                await conn.commit()
                 
                 logger.info(f"✅ Zona criada: {row['name']} (ID: {row['id']}) por {current_user.get('username')} [ADMIN]")
                 
                 zone_dict = await zone_to_dict(row)
             
-            # Sync to JSON and settings
+            # Sync to JSON (settings já sincronizado na transação)
             await sync_zones_to_json()
-            await sync_zones_to_settings()
             
             return ZoneResponse(**zone_dict)
             
@@ -651,7 +652,7 @@ async def update_zone(
                 
                 if zone_update.points is not None:
                     update_fields.append("points = %s")
-                    update_values.append(json.dumps(zone_update.points))
+                    update_values.append(Jsonb(zone_update.points))
                 
                 if not update_fields:
                     raise HTTPException(
@@ -671,17 +672,18 @@ async def update_zone(
                               created_at, updated_at
                 """
                 
-                await cur.execute(query, update_values)
+                # UPDATE + sync do safe_zone + COMMIT em um único flush
+                async with conn.pipeline():
+                    await cur.execute(query, update_values)
+                    await sync_zones_to_settings(conn)
                 row = await cur.fetchone()
-                await conn.commit()
                 
                 logger.info(f"✅ Zona atualizada: {row['name']} (ID: {row['id']}) por {current_user.get('username')} [ADMIN]")
                 
                 zone_dict = await zone_to_dict(row)
             
-            # Sync to JSON and settings
+            # Sync to JSON (settings já sincronizado na transação)
             await sync_zones_to_json()
-            await sync_zones_to_settings()
             
             return ZoneResponse(**zone_dict)
             
@@ -726,22 +728,22 @@ async def delete_zone(
                 
                 zone_name = row['name']
                 
-                # Soft delete
-                await cur.execute(
-                    """
-                    UPDATE zones
-                    SET deleted_at = NOW(), updated_at = NOW()
-                    WHERE id = %s AND deleted_at IS NULL
-                    """,
-                    (zone_id,)
-                )
+                # Soft delete + sync do safe_zone + COMMIT em um único flush
+                async with conn.pipeline():
+                    await cur.execute(
+                        """
+                        UPDATE zones
+                        SET deleted_at = NOW(), updated_at = NOW()
+                        WHERE id = %s AND deleted_at IS NULL
+                        """,
+                        (zone_id,)
+                    )
+                    await sync_zones_to_settings(conn)
                 
-                await conn.commit()
                 logger.info(f"🗑️ Zona deletada (soft delete): {zone_name} (ID: {zone_id}) por {current_user.get('username')} [ADMIN]")
             
-            # Sync to JSON and settings
+            # Sync to JSON (settings já sincronizado na transação)
             await sync_zones_to_json()
-            await sync_zones_to_settings()
             
             return None  # 204 No Content
             
@@ -919,7 +921,7 @@ async def bulk_create_zones(
                             """,
                             (
                                 zone_data.name,
-                                json.dumps(zone_data.points),
+                                Jsonb(zone_data.points),
                                 zone_data.mode,
                                 zone_data.empty_timeout,
                                 zone_data.full_timeout,
@@ -947,7 +949,7 @@ async def bulk_create_zones(
             # Sync to JSON and settings
             if created_count > 0:
                 await sync_zones_to_json()
-                await sync_zones_to_settings()
+                schedule_zone_sync()
             
             logger.info(f"✅ Bulk created {created_count} zones, {failed_count} failed by {current_user.get('username')} [ADMIN]")
             
@@ -1020,7 +1022,7 @@ async def bulk_delete_zones(
             # Sync to JSON and settings
             if deleted_count > 0:
                 await sync_zones_to_json()
-                await sync_zones_to_settings()
+                schedule_zone_sync()
             
             logger.info(f"✅ Bulk deleted {deleted_count} zones by {current_user.get('username')} [ADMIN]")
             
@@ -1077,7 +1079,7 @@ async def clone_zone(
                     )
                 
                 # Apply offset to points
-                original_points = json.loads(original['points']) if isinstance(original['points'], str) else original['points']
+                original_points = original['points']
                 new_points = [[p[0] + clone_request.offset_x, p[1] + clone_request.offset_y] for p in original_points]
                 
                 # Validate new polygon
@@ -1114,7 +1116,7 @@ async def clone_zone(
                     """,
                     (
                         clone_request.new_name,
-                        json.dumps(new_points),
+                        Jsonb(new_points),
                         original['mode'],
                         original['empty_timeout'],
                         original['full_timeout'],
@@ -1134,7 +1136,7 @@ async def clone_zone(
             
             # Sync to JSON and settings
             await sync_zones_to_json()
-            await sync_zones_to_settings()
+            schedule_zone_sync()
             
             return ZoneResponse(**zone_dict)
             
@@ -1228,7 +1230,7 @@ async def get_zone_statistics(
                 
                 total_area = 0.0
                 for row in rows:
-                    points = json.loads(row['points']) if isinstance(row['points'], str) else row['points']
+                    points = row['points']
                     total_area += calculate_polygon_area(points)
                 
                 average_area = total_area / total_zones if total_zones > 0 else 0.0
@@ -1373,7 +1375,7 @@ async def import_zones(
                             """,
                             (
                                 name,
-                                json.dumps(points),
+                                Jsonb(points),
                                 mode,
                                 zone_data.get('empty_timeout', 30.0),
                                 zone_data.get('full_timeout', 5.0),
@@ -1395,7 +1397,7 @@ async def import_zones(
         # Sync to JSON and settings
         if imported_count > 0:
             await sync_zones_to_json()
-            await sync_zones_to_settings()
+            schedule_zone_sync()
         
         logger.info(f"📤 Imported {imported_count} zones from {file.filename} by {current_user.get('username')} [ADMIN]")
         
@@ -110,9 +110,14 @@ async def lifespan(app: FastAPI):
         logger.error(f"❌ Database init failed: {e}")
         raise
 
+    partition_maintenance = asyncio.create_task(database.partition_maintenance_loop())
+    settings_listener = asyncio.create_task(database.settings_change_listener())
+
     yield
 
     logger.info("🛑 Shutting down...")
+    partition_maintenance.cancel()
+    settings_listener.cancel()
     await database.close_db_pool()
     logger.info("✅ Database closed")
 
@@ -70,12 +70,24 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 10080  # 7 dias
+    PASSWORD_HASH_SCHEME: str = "argon2"  # argon2 | bcrypt (novos hashes; ambos verificam)
+    BCRYPT_ROUNDS: int = 12  # explícito: evita o default/probe do passlib
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536  # KiB (64 MiB)
+    ARGON2_PARALLELISM: int = 2
+    RATE_LIMIT_STORAGE_URI: str = "memory://"  # redis://host:6379/0 com --workers > 1 (requer `redis`)
+    RATE_LIMIT_STRATEGY: str = "fixed-window"  # fixed-window | moving-window | fixed-window-elastic-expiry
     
     # ============================================
     # DATABASE - POSTGRESQL
     # ============================================
     DATABASE_URL: str
     DB_ECHO: bool = False
+    DB_PREPARE_THRESHOLD: Optional[int] = 1  # execuções antes do PREPARE server-side (por conexão; None desliga)
+    DB_POOL_MIN: int = 10
+    DB_POOL_MAX: int = 50
+    DB_POOL_TIMEOUT: float = 60.0  # segundos esperando conexão livre
+    DB_SYNC_METRICS: bool = False  # métricas por operação em database_sync (debug)
     ENABLE_PGVECTOR: bool = False
     
     # ============================================
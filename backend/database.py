@@ -18,15 +18,19 @@ CRITICAL: sync_zones_to_settings() RESTORED!
 """
 
 import psycopg
+from psycopg import sql
 from psycopg.rows import dict_row
+from psycopg.types.json import Jsonb, set_json_dumps, set_json_loads
 from psycopg_pool import AsyncConnectionPool
-from typing import Optional, List, Dict, Any, Tuple
-from datetime import datetime
+from typing import Optional, List, Dict, Any, Tuple, Union, Awaitable, Set, AsyncIterator
+from datetime import date, datetime
 from functools import lru_cache
 from enum import Enum
-import json
+import asyncio
 import logging
+import orjson
 import sys
+import time
 
 # Import settings
 try:
@@ -61,6 +65,16 @@ class TableName(str, Enum):
     CAMERAS = "cameras"
 
 
+# Tabelas append-only particionadas por mês (RANGE na coluna timestamp)
+PARTITIONED_TABLES: Tuple[TableName, ...] = (
+    TableName.DETECTIONS,
+    TableName.SYSTEMLOGS,
+    TableName.AUDITLOGS,
+)
+PARTITION_MONTHS_AHEAD = 2
+PARTITION_MAINTENANCE_INTERVAL = 24 * 3600.0  # seconds
+
+
 @lru_cache(maxsize=1)
 def _get_all_table_names() -> List[str]:
     """✅ Cache de nomes de tabelas"""
@@ -79,6 +93,70 @@ def _get_all_table_names() -> List[str]:
     ]
 
 
+# Colunas atualizáveis via update_user / update_alert (whitelist)
+USER_UPDATABLE_COLUMNS = frozenset({
+    "username", "email", "password_hash", "role",
+    "full_name", "phone", "email_verified", "is_active", "disabled",
+    "account_status", "last_login", "mfa_enabled", "mfa_secret",
+    "preferences", "metadata",
+})
+
+ALERT_UPDATABLE_COLUMNS = frozenset({
+    "person_id", "track_id", "out_time",
+    "zone_id", "zone_index", "zone_name",
+    "alert_type", "severity", "description",
+    "snapshot_path", "video_path",
+    "email_sent", "notification_sent",
+    "resolved_at", "resolved_by", "resolution_notes",
+    "metadata",
+})
+
+# Campos de zona que entram no settings.safe_zone (ou decidem se a zona entra)
+ZONE_SYNC_FIELDS = frozenset({
+    "name", "mode", "points",
+    "max_out_time", "email_cooldown",
+    "empty_timeout", "full_timeout", "empty_threshold", "full_threshold",
+    "active", "enabled",
+})
+
+# Connection pool tuning
+DB_POOL_MIN_SIZE = settings.DB_POOL_MIN
+DB_POOL_MAX_SIZE = settings.DB_POOL_MAX
+DB_POOL_TIMEOUT = settings.DB_POOL_TIMEOUT
+DB_POOL_MAX_IDLE = 300.0  # seconds
+DB_POOL_MAX_LIFETIME = 3600.0  # seconds
+DB_POOL_NUM_WORKERS = 4
+DB_PREPARE_THRESHOLD = settings.DB_PREPARE_THRESHOLD  # executions before server-side PREPARE
+
+# Write-behind buffers (alerts)
+WRITE_BUFFER_MAX_BATCH = 500
+WRITE_BUFFER_FLUSH_INTERVAL = 0.1  # seconds
+WRITE_BUFFER_MAX_QUEUE = 10000
+ALERT_BUFFER_FLUSH_INTERVAL = 0.05  # seconds (collector window for log_alert)
+
+# Stale-while-revalidate cache (settings / active zones)
+READ_CACHE_TTL = 30.0  # seconds
+
+# TTL cache de lookups de usuário (auth/sessão)
+USER_CACHE_TTL = 60.0  # seconds
+USER_CACHE_MAX_ENTRIES = 1000
+
+# Linhas por round trip no cursor server-side de iter_all_users
+USER_STREAM_ITERSIZE = 500
+
+# Invalidação entre processos (API / bridge do YOLO) via LISTEN/NOTIFY
+SETTINGS_NOTIFY_CHANNEL = "settings_changed"
+SETTINGS_LISTEN_RETRY = 5.0  # seconds
+
+# Janela de coalescência de update_last_login
+LAST_LOGIN_FLUSH_INTERVAL = 5.0  # seconds
+# Re-logins do mesmo usuário dentro deste intervalo não geram escrita
+LAST_LOGIN_MIN_INTERVAL = 60.0  # seconds
+
+# Debounce de sync_zones_to_settings (schedule_zone_sync)
+ZONE_SYNC_DEBOUNCE = 0.1  # seconds
+
+
 # ============================================
 # OPTIMIZATION 2: Helper Functions
 # ============================================
@@ -90,34 +168,70 @@ def _normalize_database_url(url: str) -> str:
     return url
 
 
-def _parse_json_field(value: Any) -> Any:
-    """✅ Parser seguro para campos JSON/JSONB"""
-    if isinstance(value, str):
-        try:
-            return json.loads(value)
-        except json.JSONDecodeError:
-            logger.warning(f"Invalid JSON string: {value}")
-            return value
-    return value
 
+def _month_start(year: int, month: int, offset: int = 0) -> date:
+    """✅ Primeiro dia do mês deslocado em `offset` meses (função pura)"""
+    index = year * 12 + (month - 1) + offset
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _partition_name(table: str, month: date) -> str:
+    """✅ Nome da partição mensal: <tabela>_YYYY_MM"""
+    return f"{table}_{month.year:04d}_{month.month:02d}"
 
-def _safe_json_dumps(value: Any) -> str:
-    """✅ JSON encoder seguro com fallback"""
+
+def _passthrough_json(data: bytes) -> bytes:
+    return data
+
+
+# Payload padrão (metadata/context/bbox ausentes): serializado uma única vez
+_EMPTY_JSONB = Jsonb(b"{}", dumps=_passthrough_json)
+
+
+def _safe_json_dumps(value: Any) -> Jsonb:
+    """
+    ✅ JSON encoder seguro com fallback (aceita chaves não-str e arrays numpy)
+    
+    Serializa já aqui com orjson (para o fallback funcionar) e devolve os
+    bytes embrulhados em Jsonb: o driver envia tipado como jsonb, sem
+    decode/encode de str nem segunda serialização. None / {} reutilizam
+    _EMPTY_JSONB (sem passar pelo encoder).
+    """
+    if value is None or (type(value) is dict and not value):
+        return _EMPTY_JSONB
     try:
-        return json.dumps(value or {})
+        data = orjson.dumps(
+            value,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
     except (TypeError, ValueError) as e:
         logger.warning(f"JSON encoding failed: {e}, using empty dict")
-        return "{}"
+        return _EMPTY_JSONB
+    return Jsonb(data, dumps=_passthrough_json)
+
+
+@lru_cache(maxsize=64)
+def _build_update_sql(table: str, columns: Tuple[str, ...]) -> sql.Composed:
+    """
+    ✅ Monta (e cacheia) UPDATE para um conjunto ordenado de colunas
+    
+    Cada "shape" de update gera sempre o mesmo texto SQL, permitindo
+    reuso do plano preparado no servidor. Identificadores via psycopg.sql.
+    """
+    sets = sql.SQL(", ").join(
+        sql.SQL("{} = %s").format(sql.Identifier(col)) for col in columns
+    )
+    return sql.SQL(
+        "UPDATE {} SET {}, updated_at = CURRENT_TIMESTAMP WHERE id = %s"
+    ).format(sql.Identifier(table), sets)
 
 
-def _create_history_entry(old_value: Any, new_value: Any, updated_by: str) -> Dict[str, Any]:
-    """✅ Cria entrada de histórico (função pura)"""
-    return {
-        "timestamp": datetime.now().isoformat(),
-        "old_value": old_value,
-        "new_value": str(new_value),
-        "updated_by": updated_by
-    }
+@lru_cache(maxsize=32)
+def _build_delete_sql(table: str, id_column: str) -> sql.Composed:
+    """✅ Monta (e cacheia) DELETE por chave com identificadores seguros"""
+    return sql.SQL("DELETE FROM {} WHERE {} = %s").format(
+        sql.Identifier(table), sql.Identifier(id_column)
+    )
 
 
 # ============================================
@@ -129,32 +243,276 @@ class SQL:
     
     # USER QUERIES
     SELECT_USER_BY_USERNAME = "SELECT * FROM users WHERE username = %s"
+    SELECT_ACTIVE_USER_BY_USERNAME = (
+        "SELECT * FROM users WHERE username = %s AND is_active AND NOT disabled"
+    )
     SELECT_USER_BY_EMAIL = "SELECT * FROM users WHERE email = %s"
     SELECT_USER_BY_ID = "SELECT * FROM users WHERE id = %s"
-    SELECT_ALL_USERS = "SELECT * FROM users ORDER BY created_at DESC"
-    UPDATE_LAST_LOGIN = "UPDATE users SET last_login = CURRENT_TIMESTAMP WHERE username = %s"
+    # Listagem: sem password_hash / mfa_secret (nunca usados por quem lista)
+    _USER_LIST_COLUMNS = (
+        "id, username, email, role, full_name, phone, email_verified, "
+        "is_active, disabled, account_status, last_login, mfa_enabled, "
+        "preferences, metadata, created_at, updated_at"
+    )
+    SELECT_ALL_USERS = f"SELECT {_USER_LIST_COLUMNS} FROM users ORDER BY created_at DESC"
+    SELECT_ALL_USERS_FULL = "SELECT * FROM users ORDER BY created_at DESC"
+    # Keyset: cursor = (created_at, id) da última linha da página anterior
+    SELECT_USERS_PAGE = f"""
+        SELECT {_USER_LIST_COLUMNS} FROM users
+        ORDER BY created_at DESC, id DESC
+        LIMIT %s
+    """
+    SELECT_USERS_PAGE_BEFORE = f"""
+        SELECT {_USER_LIST_COLUMNS} FROM users
+        WHERE (created_at, id) < (%s, %s)
+        ORDER BY created_at DESC, id DESC
+        LIMIT %s
+    """
+    UPDATE_LAST_LOGIN_BATCH = """
+        UPDATE users SET last_login = to_timestamp(v.ts)
+        FROM unnest(%s::text[], %s::float8[]) AS v(username, ts)
+        WHERE users.username = v.username
+    """
     DELETE_USER = "DELETE FROM users WHERE id = %s"
     UPDATE_USER_ROLE = "UPDATE users SET role = %s WHERE id = %s"
+    INSERT_USER = """
+        INSERT INTO users (
+            username, email, password_hash, role,
+            full_name, phone, email_verified, is_active, account_status,
+            metadata, preferences
+        )
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        ON CONFLICT DO NOTHING
+        RETURNING id
+    """
     
     # ZONE QUERIES
     SELECT_ALL_ZONES = "SELECT * FROM zones WHERE deleted_at IS NULL ORDER BY id"
     SELECT_ACTIVE_ZONES = "SELECT * FROM zones WHERE active = TRUE AND enabled = TRUE AND deleted_at IS NULL ORDER BY id"
     SELECT_ZONE_BY_ID = "SELECT * FROM zones WHERE id = %s AND deleted_at IS NULL"
-    DELETE_ZONE_SOFT = "UPDATE zones SET deleted_at = CURRENT_TIMESTAMP, active = FALSE, enabled = FALSE WHERE id = %s"
-    DELETE_ZONE_HARD = "DELETE FROM zones WHERE id = %s"
+    # GiST poly_ops só indexa polygon @> polygon: o ponto vira polígono
+    # degenerado (candidatos pelo índice) e @> point confirma o resultado exato
+    SELECT_ZONES_CONTAINING_POINT = """
+        SELECT id, name, mode FROM zones
+        WHERE points_geom @> polygon(box(point(%(x)s, %(y)s), point(%(x)s, %(y)s)))
+          AND points_geom @> point(%(x)s, %(y)s)
+          AND active = TRUE AND enabled = TRUE AND deleted_at IS NULL
+        ORDER BY id
+    """
+    
+    # ZONE WRITES + settings.safe_zone sync (single statement)
+    #
+    # CTEs de escrita não enxergam as linhas uns dos outros, então
+    # `zone_set` combina o snapshot de zones (sem a zona alterada) com
+    # o RETURNING da escrita antes de agregar o JSON do safe_zone.
+    _ZONE_SYNC_COLUMNS = (
+        "id, name, mode, points, max_out_time, email_cooldown, "
+        "empty_timeout, full_timeout, empty_threshold, full_threshold, "
+        "enabled, active, deleted_at"
+    )
+    _SYNC_SAFE_ZONE_FROM_ZONE_SET = """
+        sync AS (
+            INSERT INTO settings (key, value, updated_by)
+            SELECT
+                'safe_zone',
+                COALESCE(jsonb_agg(jsonb_strip_nulls(jsonb_build_object(
+                    'name', z.name,
+                    'mode', z.mode,
+                    'points', z.points,
+                    'max_out_time', z.max_out_time,
+                    'email_cooldown', z.email_cooldown,
+                    'empty_timeout', z.empty_timeout,
+                    'full_timeout', z.full_timeout,
+                    'empty_threshold', z.empty_threshold,
+                    'full_threshold', z.full_threshold
+                )) ORDER BY z.id), '[]'::jsonb)::text,
+                'system'
+            FROM zone_set z
+            WHERE z.active AND z.enabled AND z.deleted_at IS NULL
+            ON CONFLICT (key) DO UPDATE
+            SET value = EXCLUDED.value,
+                updated_at = CURRENT_TIMESTAMP,
+                updated_by = EXCLUDED.updated_by
+            RETURNING jsonb_array_length(value::jsonb) AS zone_count
+        )
+    """
+    SYNC_SAFE_ZONE = f"""
+        WITH zone_set AS (
+            SELECT {_ZONE_SYNC_COLUMNS} FROM zones
+        ),
+        {_SYNC_SAFE_ZONE_FROM_ZONE_SET}
+        SELECT zone_count FROM sync
+    """
+    INSERT_ZONE_AND_SYNC = f"""
+        WITH written AS (
+            INSERT INTO zones (
+                name, mode, points, max_out_time, email_cooldown,
+                empty_timeout, full_timeout, empty_threshold, full_threshold,
+                enabled, active, description
+            )
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            RETURNING {_ZONE_SYNC_COLUMNS}
+        ),
+        zone_set AS (
+            SELECT {_ZONE_SYNC_COLUMNS} FROM zones
+            UNION ALL
+            SELECT {_ZONE_SYNC_COLUMNS} FROM written
+        ),
+        {_SYNC_SAFE_ZONE_FROM_ZONE_SET}
+        SELECT id FROM written
+    """
+    UPDATE_ZONE = "SELECT id FROM update_zone_partial(%s, %s::jsonb)"
+    UPDATE_ZONE_AND_SYNC = f"""
+        WITH written AS (
+            SELECT {_ZONE_SYNC_COLUMNS}
+            FROM update_zone_partial(%s, %s::jsonb)
+        ),
+        zone_set AS (
+            SELECT {_ZONE_SYNC_COLUMNS} FROM zones
+            WHERE id NOT IN (SELECT id FROM written)
+            UNION ALL
+            SELECT {_ZONE_SYNC_COLUMNS} FROM written
+        ),
+        {_SYNC_SAFE_ZONE_FROM_ZONE_SET}
+        SELECT id FROM written
+    """
+    DELETE_ZONE_SOFT_AND_SYNC = f"""
+        WITH written AS (
+            UPDATE zones
+            SET deleted_at = CURRENT_TIMESTAMP, active = FALSE, enabled = FALSE
+            WHERE id = %s
+            RETURNING id
+        ),
+        zone_set AS (
+            SELECT {_ZONE_SYNC_COLUMNS} FROM zones
+            WHERE id NOT IN (SELECT id FROM written)
+        ),
+        {_SYNC_SAFE_ZONE_FROM_ZONE_SET}
+        SELECT id FROM written
+    """
+    DELETE_ZONE_HARD_AND_SYNC = f"""
+        WITH written AS (
+            DELETE FROM zones WHERE id = %s
+            RETURNING id
+        ),
+        zone_set AS (
+            SELECT {_ZONE_SYNC_COLUMNS} FROM zones
+            WHERE id NOT IN (SELECT id FROM written)
+        ),
+        {_SYNC_SAFE_ZONE_FROM_ZONE_SET}
+        SELECT id FROM written
+    """
     
     # SETTINGS QUERIES
-    SELECT_SETTING = "SELECT * FROM settings WHERE key = %s"
+    SELECT_SETTING = "SELECT value FROM settings WHERE key = %s"
+    SELECT_SETTING_JSON = "SELECT value_json FROM settings WHERE key = %s"
     SELECT_ALL_SETTINGS = "SELECT key, value, category, data_type FROM settings"
+    UPSERT_SETTING = """
+        INSERT INTO settings (
+            key, value, updated_at, updated_by,
+            category, data_type, description, change_history
+        )
+        VALUES (
+            %(key)s, %(value)s, CURRENT_TIMESTAMP, %(updated_by)s,
+            %(category)s, %(data_type)s, %(description)s,
+            jsonb_build_array(jsonb_build_object(
+                'timestamp', now(),
+                'old_value', NULL,
+                'new_value', %(value)s::text,
+                'updated_by', %(updated_by)s::text
+            ))
+        )
+        ON CONFLICT (key) DO UPDATE
+        SET value = EXCLUDED.value,
+            updated_at = CURRENT_TIMESTAMP,
+            updated_by = EXCLUDED.updated_by,
+            category = EXCLUDED.category,
+            data_type = EXCLUDED.data_type,
+            description = COALESCE(EXCLUDED.description, settings.description),
+            change_history = settings.change_history || jsonb_build_array(jsonb_build_object(
+                'timestamp', now(),
+                'old_value', settings.value,
+                'new_value', EXCLUDED.value,
+                'updated_by', EXCLUDED.updated_by
+            ))
+    """
     
     # ALERTS QUERIES
-    SELECT_RECENT_ALERTS = "SELECT * FROM alerts ORDER BY created_at DESC LIMIT %s"
+    INSERT_ALERT = """
+        INSERT INTO alerts (
+            person_id, out_time, snapshot_path, email_sent, notification_sent,
+            track_id, video_path, zone_index, zone_id, zone_name,
+            alert_type, severity, description, metadata
+        )
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    """
+    INSERT_ALERT_RETURNING_ID = INSERT_ALERT + "    RETURNING id\n"
+    UPDATE_ALERT_MEDIA = """
+        UPDATE alerts
+        SET snapshot_path = COALESCE(%s, snapshot_path),
+            video_path = COALESCE(%s, video_path),
+            updated_at = CURRENT_TIMESTAMP
+        WHERE id = %s
+    """
+    SELECT_RECENT_ALERTS = "SELECT * FROM alerts ORDER BY created_at DESC, id DESC LIMIT %s"
+    SELECT_RECENT_ALERTS_BEFORE = """
+        SELECT * FROM alerts
+        WHERE (created_at, id) < (%s, %s)
+        ORDER BY created_at DESC, id DESC
+        LIMIT %s
+    """
+    # Projeta só as colunas de idx_alerts_created_cover (index-only scan)
+    SELECT_RECENT_ALERTS_SUMMARY = """
+        SELECT id, person_id, zone_id, zone_name, severity, resolved_at, created_at
+        FROM alerts
+        ORDER BY created_at DESC, id DESC
+        LIMIT %s
+    """
+    SELECT_RECENT_ALERTS_SUMMARY_BEFORE = """
+        SELECT id, person_id, zone_id, zone_name, severity, resolved_at, created_at
+        FROM alerts
+        WHERE (created_at, id) < (%s, %s)
+        ORDER BY created_at DESC, id DESC
+        LIMIT %s
+    """
+    SELECT_UNRESOLVED_ALERTS = (
+        "SELECT * FROM alerts WHERE resolved_at IS NULL ORDER BY created_at DESC LIMIT %s"
+    )
     DELETE_ALERT = "DELETE FROM alerts WHERE id = %s"
     
     # SYSTEM LOGS QUERIES
-    SELECT_SYSTEM_LOGS = "SELECT * FROM systemlogs ORDER BY timestamp DESC LIMIT %s"
+    INSERT_SYSTEM_LOG = """
+        INSERT INTO systemlogs
+        (action, username, reason, email_sent, ip_address, user_agent, context, session_id)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+    """
+    COPY_SYSTEM_LOGS = """
+        COPY systemlogs
+        (action, username, reason, email_sent, ip_address, user_agent, context, session_id)
+        FROM STDIN
+    """
+    SELECT_SYSTEM_LOGS = "SELECT * FROM systemlogs ORDER BY timestamp DESC, id DESC LIMIT %s"
+    SELECT_SYSTEM_LOGS_BEFORE = """
+        SELECT * FROM systemlogs
+        WHERE (timestamp, id) < (%s, %s)
+        ORDER BY timestamp DESC, id DESC
+        LIMIT %s
+    """
     
     # DETECTIONS QUERIES
+    INSERT_DETECTION = """
+        INSERT INTO detections (
+            track_id, zone_index, zone_id, zone_name, confidence,
+            bbox, status, duration_seconds, metadata
+        )
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+    """
+    COPY_DETECTIONS = """
+        COPY detections (
+            track_id, zone_index, zone_id, zone_name, confidence,
+            bbox, status, duration_seconds, metadata
+        ) FROM STDIN
+    """
     SELECT_DETECTIONS_BY_TRACK = """
         SELECT * FROM detections 
         WHERE track_id = %s 
@@ -163,23 +521,50 @@ class SQL:
     """
     
     # KNOWLEDGE BASE QUERIES
-    SEARCH_KNOWLEDGE_ALL = """
-        SELECT * FROM knowledgebase 
-        WHERE title ILIKE %s OR content ILIKE %s
-        ORDER BY updated_at DESC 
+    INSERT_KNOWLEDGE = """
+        INSERT INTO knowledgebase (title, content, category, source, tags, metadata)
+        VALUES (%s, %s, %s, %s, %s, %s)
+        RETURNING id
+    """
+    _KNOWLEDGE_COLUMNS = (
+        "kb.id, kb.title, kb.content, kb.category, kb.source, "
+        "kb.created_at, kb.updated_at, kb.metadata, kb.tags"
+    )
+    SEARCH_KNOWLEDGE_ALL = f"""
+        SELECT {_KNOWLEDGE_COLUMNS}
+        FROM knowledgebase kb, plainto_tsquery('simple', %s) AS q
+        WHERE kb.content_tsv @@ q
+        ORDER BY ts_rank_cd(kb.content_tsv, q) DESC
+        LIMIT %s
+    """
+    SEARCH_KNOWLEDGE_BY_CATEGORY = f"""
+        SELECT {_KNOWLEDGE_COLUMNS}
+        FROM knowledgebase kb, plainto_tsquery('simple', %s) AS q
+        WHERE kb.content_tsv @@ q AND kb.category = %s
+        ORDER BY ts_rank_cd(kb.content_tsv, q) DESC
         LIMIT %s
     """
     
     # CONVERSATIONS QUERIES
+    INSERT_CONVERSATION_MESSAGE = """
+        INSERT INTO conversations (user_id, session_id, message, role, metadata, context)
+        VALUES (%s, %s, %s, %s, %s, %s)
+    """
     SELECT_CONVERSATION_HISTORY = """
         SELECT * FROM conversations 
         WHERE session_id = %s 
-        ORDER BY timestamp ASC 
+        ORDER BY timestamp ASC, id ASC 
+        LIMIT %s
+    """
+    SELECT_CONVERSATION_HISTORY_AFTER = """
+        SELECT * FROM conversations
+        WHERE session_id = %s AND (timestamp, id) > (%s, %s)
+        ORDER BY timestamp ASC, id ASC
         LIMIT %s
     """
     
     # MISC QUERIES
-    COUNT_ZONES = "SELECT COUNT(*) as count FROM zones WHERE deleted_at IS NULL"
+    ANY_ZONE_EXISTS = "SELECT 1 FROM zones WHERE deleted_at IS NULL LIMIT 1"
 
 
 # ============================================
@@ -187,26 +572,61 @@ class SQL:
 # ============================================
 
 pool: Optional[AsyncConnectionPool] = None
+_pool_lock: Optional[asyncio.Lock] = None
+_pool_lock_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_pool_lock() -> asyncio.Lock:
+    """✅ Lock de criação do pool, recriado se o event loop mudar"""
+    global _pool_lock, _pool_lock_loop
+    loop = asyncio.get_running_loop()
+    if _pool_lock is None or _pool_lock_loop is not loop:
+        _pool_lock = asyncio.Lock()
+        _pool_lock_loop = loop
+    return _pool_lock
+
+
+async def _configure_connection(conn: psycopg.AsyncConnection) -> None:
+    """✅ Configura cada conexão nova do pool (prepared statements, JSON via orjson)"""
+    conn.prepare_threshold = DB_PREPARE_THRESHOLD
+    set_json_loads(orjson.loads, conn)
+    set_json_dumps(orjson.dumps, conn)
 
 
 async def get_db_pool() -> AsyncConnectionPool:
-    """Obtém connection pool do PostgreSQL"""
+    """
+    Obtém connection pool do PostgreSQL
+    
+    ✅ Criação protegida por lock: chamadas concorrentes na subida da
+    aplicação compartilham um único pool (sem pools duplicados/vazados).
+    """
     global pool
     
-    if pool is None:
+    if pool is not None:
+        return pool
+    
+    async with _get_pool_lock():
+        if pool is not None:
+            return pool
         try:
             db_url = _normalize_database_url(settings.DATABASE_URL)
             
-            pool = AsyncConnectionPool(
+            new_pool = AsyncConnectionPool(
                 conninfo=db_url,
-                min_size=2,
-                max_size=10,
-                timeout=60,
+                min_size=DB_POOL_MIN_SIZE,
+                max_size=DB_POOL_MAX_SIZE,
+                timeout=DB_POOL_TIMEOUT,
+                max_idle=DB_POOL_MAX_IDLE,
+                max_lifetime=DB_POOL_MAX_LIFETIME,
+                num_workers=DB_POOL_NUM_WORKERS,
                 kwargs={"row_factory": dict_row},
+                configure=_configure_connection,
+                check=AsyncConnectionPool.check_connection,
                 open=False
             )
             
-            await pool.open()
+            await new_pool.open()
+            pool = new_pool
             logger.info("✅ PostgreSQL pool created (psycopg3)")
             
         except Exception as e:
@@ -216,10 +636,20 @@ async def get_db_pool() -> AsyncConnectionPool:
     return pool
 
 
+def get_pool_stats() -> Dict[str, int]:
+    """✅ Contadores do pool (conexões, fila de espera, timeouts); vazio se não criado"""
+    return pool.get_stats() if pool is not None else {}
+
+
 async def close_db_pool() -> None:
     """Fecha connection pool"""
     global pool
     if pool:
+        await flush_alerts()
+        await flush_detections()
+        await flush_system_logs()
+        await flush_last_logins()
+        await _zone_sync_trigger.flush()
         await pool.close()
         pool = None
         logger.info("✅ PostgreSQL pool closed")
@@ -230,17 +660,24 @@ async def close_db_pool() -> None:
 # ============================================
 
 async def _execute_query(
-    query: str,
-    params: Tuple = (),
-    fetch: str = "none"
+    query: Union[str, sql.Composable],
+    params: Union[Tuple, Dict[str, Any]] = (),
+    fetch: str = "none",
+    prepare: Optional[bool] = None
 ) -> Optional[Any]:
     """
     ✅ Generic query executor (elimina repetição)
     
+    Statement único em autocommit: sem os round trips de BEGIN/COMMIT
+    que o psycopg emitiria ao redor de cada escrita. Unidades com mais
+    de um statement continuam usando transação explícita.
+    
     Args:
         query: SQL query string
-        params: Query parameters
-        fetch: "one", "all", or "none"
+        params: Query parameters (tuple posicional ou dict nomeado)
+        fetch: "one", "all", "rowcount" (linhas afetadas) or "none"
+        prepare: True força PREPARE já na 1ª execução (hot paths);
+            None segue o prepare_threshold da conexão
     
     Returns:
         Query result or None
@@ -248,32 +685,366 @@ async def _execute_query(
     pool = await get_db_pool()
     
     async with pool.connection() as conn:
-        async with conn.cursor() as cur:
-            await cur.execute(query, params)
+        # Conexão ociosa: alternar autocommit é local (sem round trip)
+        await conn.set_autocommit(True)
+        try:
+            # conn.execute(): cursor interno, sem o par __aenter__/__aexit__
+            cur = await conn.execute(query, params, prepare=prepare)
             
             if fetch == "one":
                 result = await cur.fetchone()
             elif fetch == "all":
                 result = await cur.fetchall()
+            elif fetch == "rowcount":
+                result = cur.rowcount
             else:
                 result = None
+        finally:
+            await conn.set_autocommit(False)
+        
+        return result
+
+
+class _WriteBehindBuffer:
+    """
+    ✅ Buffer write-behind para INSERTs de alto volume
+    
+    Linhas são enfileiradas em um asyncio.Queue e gravadas em lote
+    (executemany em pipeline mode, ou COPY se `copy_sql` for informado)
+    a cada `flush_interval` segundos ou `max_batch` linhas.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        insert_sql: str,
+        max_batch: int = WRITE_BUFFER_MAX_BATCH,
+        flush_interval: float = WRITE_BUFFER_FLUSH_INTERVAL,
+        max_queue: int = WRITE_BUFFER_MAX_QUEUE,
+        copy_sql: Optional[str] = None
+    ):
+        self.name = name
+        self.insert_sql = insert_sql
+        self.copy_sql = copy_sql
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        # Uma fila + task flusher por event loop (API e bridge do database_sync)
+        self._workers: Dict[asyncio.AbstractEventLoop, Tuple[asyncio.Queue, asyncio.Task]] = {}
+    
+    def _ensure_worker(self) -> asyncio.Queue:
+        """Fila do event loop corrente, com a task flusher rodando"""
+        loop = asyncio.get_running_loop()
+        worker = self._workers.get(loop)
+        if worker is not None and not worker[1].done():
+            return worker[0]
+        
+        for old_loop in [l for l in self._workers if l.is_closed()]:
+            del self._workers[old_loop]
+        # Task morta (ex.: cancelada): reaproveita a fila e o que houver nela
+        queue = worker[0] if worker is not None else asyncio.Queue(maxsize=self.max_queue)
+        task = loop.create_task(self._run(queue), name=f"{self.name}-flusher")
+        self._workers[loop] = (queue, task)
+        return queue
+    
+    async def put(self, row: Tuple) -> None:
+        """Enfileira uma linha para gravação em lote"""
+        await self._ensure_worker().put(row)
+    
+    async def _run(self, queue: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self.flush_interval
+            
+            while len(batch) < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
             
+            try:
+                await self._write(batch)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+    
+    async def write_batch(self, rows: List[Tuple]) -> None:
+        """Grava as linhas imediatamente (COPY ou pipeline mode, 1 commit)"""
+        pool = await get_db_pool()
+        async with pool.connection() as conn:
+            if self.copy_sql and len(rows) > 1:
+                async with conn.cursor() as cur:
+                    async with cur.copy(self.copy_sql) as copy:
+                        for row in rows:
+                            await copy.write_row(row)
+            else:
+                async with conn.pipeline():
+                    async with conn.cursor() as cur:
+                        await cur.executemany(self.insert_sql, rows)
             await conn.commit()
-            return result
+    
+    async def _write(self, rows: List[Tuple]) -> None:
+        try:
+            await self.write_batch(rows)
+        except Exception as e:
+            logger.error(f"❌ {self.name}: failed to write {len(rows)} rows: {e}")
+    
+    async def flush(self) -> None:
+        """Aguarda a gravação de tudo que está pendente no loop corrente (shutdown)"""
+        worker = self._workers.get(asyncio.get_running_loop())
+        if worker is None:
+            return
+        queue, task = worker
+        if task.done():
+            # Flusher parou (cancelado): grava o resto aqui mesmo
+            rows = []
+            while not queue.empty():
+                rows.append(queue.get_nowait())
+                queue.task_done()
+            if rows:
+                await self._write(rows)
+            return
+        await queue.join()
+
+
+_alert_buffer = _WriteBehindBuffer(
+    "alerts", SQL.INSERT_ALERT, flush_interval=ALERT_BUFFER_FLUSH_INTERVAL
+)
+_detection_buffer = _WriteBehindBuffer(
+    "detections", SQL.INSERT_DETECTION, copy_sql=SQL.COPY_DETECTIONS
+)
+_system_log_buffer = _WriteBehindBuffer(
+    "systemlogs", SQL.INSERT_SYSTEM_LOG, copy_sql=SQL.COPY_SYSTEM_LOGS
+)
+
+
+class _StaleWhileRevalidateCache:
+    """
+    ✅ Cache em processo com stale-while-revalidate
+    
+    Entradas expiradas continuam sendo servidas enquanto uma única
+    task de refresh (coalescida por chave) recarrega o valor em
+    background. Só o primeiro acesso (cache vazio) espera o banco.
+    """
+    
+    def __init__(self, name: str, ttl: float = READ_CACHE_TTL):
+        self.name = name
+        self.ttl = ttl
+        self._entries: Dict[str, Tuple[Any, float]] = {}
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self._generation = 0
+    
+    async def get(self, key: str, loader) -> Any:
+        """Retorna o valor cacheado, disparando refresh se estiver stale"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                self._schedule_refresh(key, loader)
+            return value
+        
+        return await asyncio.shield(self._schedule_refresh(key, loader))
+    
+    def _schedule_refresh(self, key: str, loader) -> asyncio.Task:
+        loop = asyncio.get_running_loop()
+        task = self._refreshing.get(key)
+        if task is None or task.done() or task.get_loop() is not loop:
+            task = loop.create_task(self._refresh(key, loader, self._generation))
+            # Refresh em background: consome a exceção (já logada em _refresh)
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._refreshing[key] = task
+        return task
+    
+    async def _refresh(self, key: str, loader, generation: int) -> Any:
+        try:
+            value = await loader()
+            # Descarta o resultado se houve invalidação durante o load
+            if generation == self._generation:
+                self._entries[key] = (value, time.monotonic() + self.ttl)
+            return value
+        except Exception as e:
+            logger.error(f"❌ {self.name} cache: refresh of '{key}' failed: {e}")
+            raise
+        finally:
+            if self._refreshing.get(key) is asyncio.current_task():
+                del self._refreshing[key]
+    
+    def invalidate(self, *keys: str) -> None:
+        """Remove chaves específicas (ou tudo, sem argumentos)"""
+        self._generation += 1
+        if keys:
+            for key in keys:
+                self._entries.pop(key, None)
+        else:
+            self._entries.clear()
+
+
+_read_cache = _StaleWhileRevalidateCache("settings/zones")
+
+_CACHE_ALL_SETTINGS = "settings:*"
+_CACHE_ACTIVE_ZONES = "zones:active"
+
+
+def _setting_cache_key(key: str) -> str:
+    return f"setting:{key}"
+
+
+def _setting_json_cache_key(key: str) -> str:
+    return f"setting_json:{key}"
+
+
+class _UserCache:
+    """
+    ✅ TTL cache limitado para lookups de usuário
+    
+    Chaves (dimensão, valor), ex.: ("username", "admin"), ("id", 1).
+    Sem stale: entradas expiradas vão ao banco (auth não pode servir
+    usuário desativado além do TTL). Só linhas encontradas são cacheadas.
+    ✅ Single-flight: misses concorrentes da mesma chave (burst de
+    requests com o mesmo JWT) aguardam um único load.
+    """
+    
+    def __init__(self, ttl: float = USER_CACHE_TTL, max_entries: int = USER_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: Dict[Tuple[str, Any], Tuple[Dict[str, Any], float]] = {}
+        self._inflight: Dict[Tuple[str, Any], asyncio.Task] = {}
+        self._generation = 0
+    
+    async def get(self, dimension: str, value: Any, loader) -> Optional[Dict[str, Any]]:
+        """Retorna cópia da linha cacheada ou carrega via loader()"""
+        key = (dimension, value)
+        entry = self._entries.get(key)
+        if entry is not None:
+            row, expires_at = entry
+            if expires_at > time.monotonic():
+                return dict(row)
+            del self._entries[key]
+        
+        task = self._inflight.get(key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(self._load(key, loader))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        
+        # shield: cancelar um chamador não cancela o load dos demais
+        row = await asyncio.shield(task)
+        return dict(row) if row is not None else None
+    
+    def _forget(self, key: Tuple[str, Any], task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+    
+    async def _load(self, key: Tuple[str, Any], loader) -> Optional[Dict[str, Any]]:
+        generation = self._generation
+        row = await loader()
+        # Descarta o resultado se houve invalidação durante o load
+        if row is not None and generation == self._generation:
+            if len(self._entries) >= self.max_entries:
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = (dict(row), time.monotonic() + self.ttl)
+        return row
+    
+    def invalidate(self, user_id: Optional[int] = None, username: Optional[str] = None) -> None:
+        """Remove as entradas do usuário (ou tudo, sem argumentos)"""
+        self._generation += 1
+        # Loads em andamento leram antes da mudança: ninguém novo entra neles
+        self._inflight.clear()
+        if user_id is None and username is None:
+            self._entries.clear()
+            return
+        stale = [
+            key for key, (row, _) in self._entries.items()
+            if (user_id is not None and row.get('id') == user_id)
+            or (username is not None and row.get('username') == username)
+        ]
+        for key in stale:
+            del self._entries[key]
+
+
+_user_cache = _UserCache()
+
+
+class _CoalescingTrigger:
+    """
+    ✅ Executa `action` no máximo uma vez a cada `delay` segundos
+    
+    Chamadas a trigger() durante a espera são coalescidas em uma única
+    execução; chamadas durante a execução agendam mais uma rodada.
+    """
+    
+    def __init__(self, name: str, action, delay: float):
+        self.name = name
+        self.action = action
+        self.delay = delay
+        self._event: Optional[asyncio.Event] = None
+        self._idle: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    def _ensure_worker(self) -> None:
+        """Cria eventos + task worker no event loop corrente"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._event = asyncio.Event()
+            self._idle = asyncio.Event()
+            self._idle.set()
+            self._loop = loop
+            self._task = None
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._run(), name=f"{self.name}-debouncer")
+    
+    def trigger(self) -> None:
+        """Agenda uma execução (não bloqueia)"""
+        self._ensure_worker()
+        self._idle.clear()
+        self._event.set()
+    
+    async def _run(self) -> None:
+        while True:
+            await self._event.wait()
+            await asyncio.sleep(self.delay)
+            self._event.clear()
+            try:
+                await self.action()
+            except Exception as e:
+                logger.error(f"❌ {self.name}: {e}")
+            finally:
+                if not self._event.is_set():
+                    self._idle.set()
+    
+    async def flush(self) -> None:
+        """Aguarda a execução pendente, se houver (shutdown)"""
+        if self._idle is None or self._loop is not asyncio.get_running_loop():
+            return
+        if self._task is not None and not self._task.done():
+            await self._idle.wait()
+
+
+_zone_sync_trigger = _CoalescingTrigger(
+    "zone-sync", lambda: sync_zones_to_settings(), ZONE_SYNC_DEBOUNCE
+)
 
 
 async def _execute_delete(table: str, id_value: int, id_column: str = "id") -> bool:
-    """✅ Generic delete operation"""
+    """✅ Generic delete operation (True só se alguma linha foi removida)"""
+    # ✅ CORREÇÃO: Extrair valor se for Enum
+    table_name = table.value if hasattr(table, 'value') else table
     try:
-        # ✅ CORREÇÃO: Extrair valor se for Enum
-        table_name = table.value if hasattr(table, 'value') else table
-        
-        await _execute_query(f"DELETE FROM {table_name} WHERE {id_column} = %s", (id_value,))
-        logger.info(f"✅ Deleted from {table_name} (ID: {id_value})")
-        return True
-    except Exception as e:
+        deleted = await _execute_query(
+            _build_delete_sql(table_name, id_column), (id_value,), fetch="rowcount"
+        )
+    except psycopg.Error as e:
         logger.error(f"❌ Error deleting from {table_name}: {e}")
         return False
+    
+    if deleted:
+        logger.info(f"✅ Deleted from {table_name} (ID: {id_value})")
+    return deleted > 0
 
 
 
@@ -290,12 +1061,17 @@ async def drop_all_tables() -> None:
         
         for table in _get_all_table_names():
             try:
-                await conn.execute(f"DROP TABLE IF EXISTS {table} CASCADE")
+                await conn.execute(
+                    sql.SQL("DROP TABLE IF EXISTS {} CASCADE").format(sql.Identifier(table.value))
+                )
                 logger.info(f"✅ Dropped table: {table}")
             except Exception as e:
                 logger.warning(f"⚠️ Could not drop {table}: {e}")
         
         await conn.commit()
+        _read_cache.invalidate()
+        _user_cache.invalidate()
+        _last_login_recorded.clear()
         logger.warning("✅ All tables dropped!")
 
 
@@ -350,6 +1126,13 @@ async def init_database(force_recreate: bool = False) -> None:
                 updated_at TIMESTAMP
             )
         """)
+        # Partial index para o hot path de autenticação (usuários ativos)
+        await conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_users_active_username
+            ON users(username)
+            WHERE is_active AND NOT disabled
+        """)
+        
         logger.info("✅ Tabela 'users' criada (v3.0)")
         
         # ==================== SETTINGS TABLE v3.0 ====================
@@ -380,6 +1163,48 @@ async def init_database(force_recreate: bool = False) -> None:
                 change_history JSONB DEFAULT '[]'::jsonb
             )
         """)
+        
+        # value_json: cópia JSONB de `value` (NULL se não for JSON válido).
+        # Gerada no servidor, então todo writer (set_setting, sync do
+        # safe_zone, SQL das APIs) a mantém em dia; leitores recebem
+        # list/dict direto do driver, sem json.loads.
+        await conn.execute("""
+            CREATE OR REPLACE FUNCTION try_jsonb(txt TEXT)
+            RETURNS jsonb
+            LANGUAGE plpgsql IMMUTABLE AS $$
+            BEGIN
+                RETURN txt::jsonb;
+            EXCEPTION WHEN others THEN
+                RETURN NULL;
+            END
+            $$
+        """)
+        await conn.execute("""
+            ALTER TABLE settings ADD COLUMN IF NOT EXISTS value_json JSONB
+            GENERATED ALWAYS AS (try_jsonb(value)) STORED
+        """)
+        
+        # NOTIFY por chave alterada: outros processos descartam o cache
+        # (pg_notify deduplica payloads iguais na mesma transação)
+        await conn.execute(f"""
+            CREATE OR REPLACE FUNCTION notify_settings_changed() RETURNS trigger
+            LANGUAGE plpgsql AS $$
+            BEGIN
+                IF TG_OP = 'DELETE' THEN
+                    PERFORM pg_notify('{SETTINGS_NOTIFY_CHANNEL}', OLD.key);
+                ELSE
+                    PERFORM pg_notify('{SETTINGS_NOTIFY_CHANNEL}', NEW.key);
+                END IF;
+                RETURN NULL;
+            END
+            $$
+        """)
+        await conn.execute("DROP TRIGGER IF EXISTS trg_settings_notify ON settings")
+        await conn.execute("""
+            CREATE TRIGGER trg_settings_notify
+            AFTER INSERT OR UPDATE OR DELETE ON settings
+            FOR EACH ROW EXECUTE FUNCTION notify_settings_changed()
+        """)
         logger.info("✅ Tabela 'settings' criada (v3.0)")
         
         # ==================== ZONES TABLE v3.0 ====================
@@ -413,8 +1238,62 @@ async def init_database(force_recreate: bool = False) -> None:
             )
         """)
         
+        # Geometria nativa derivada de points (JSONB) → polygon + GiST
+        await conn.execute("""
+            CREATE OR REPLACE FUNCTION zone_points_to_polygon(pts JSONB)
+            RETURNS polygon
+            LANGUAGE plpgsql IMMUTABLE AS $$
+            BEGIN
+                IF pts IS NULL OR jsonb_typeof(pts) <> 'array' OR jsonb_array_length(pts) < 3 THEN
+                    RETURN NULL;
+                END IF;
+                RETURN (
+                    SELECT ('(' || string_agg(
+                        '(' || (p->>0) || ',' || (p->>1) || ')', ',' ORDER BY ord
+                    ) || ')')::polygon
+                    FROM jsonb_array_elements(pts) WITH ORDINALITY AS t(p, ord)
+                );
+            EXCEPTION WHEN others THEN
+                RETURN NULL;
+            END
+            $$
+        """)
+        await conn.execute("""
+            ALTER TABLE zones ADD COLUMN IF NOT EXISTS points_geom polygon
+            GENERATED ALWAYS AS (zone_points_to_polygon(points)) STORED
+        """)
+        
+        # Update parcial (merge com os valores atuais) no servidor:
+        # campos ausentes/NULL em `p` mantêm o valor existente
+        await conn.execute("""
+            CREATE OR REPLACE FUNCTION update_zone_partial(p_id INTEGER, p JSONB)
+            RETURNS SETOF zones
+            LANGUAGE plpgsql AS $$
+            BEGIN
+                RETURN QUERY
+                UPDATE zones SET
+                    name = COALESCE(NULLIF(p->>'name', ''), zones.name),
+                    mode = COALESCE(NULLIF(p->>'mode', ''), zones.mode),
+                    points = COALESCE(NULLIF(p->'points', 'null'::jsonb), zones.points),
+                    max_out_time = COALESCE((p->>'max_out_time')::real, zones.max_out_time),
+                    email_cooldown = COALESCE((p->>'email_cooldown')::real, zones.email_cooldown),
+                    empty_timeout = COALESCE((p->>'empty_timeout')::real, zones.empty_timeout),
+                    full_timeout = COALESCE((p->>'full_timeout')::real, zones.full_timeout),
+                    empty_threshold = COALESCE((p->>'empty_threshold')::integer, zones.empty_threshold),
+                    full_threshold = COALESCE((p->>'full_threshold')::integer, zones.full_threshold),
+                    enabled = COALESCE((p->>'enabled')::boolean, zones.enabled),
+                    active = COALESCE((p->>'active')::boolean, zones.active),
+                    description = COALESCE(p->>'description', zones.description),
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE zones.id = p_id AND zones.deleted_at IS NULL
+                RETURNING zones.*;
+            END
+            $$
+        """)
+        
         # Índices otimizados
         for index_sql in [
+            "CREATE INDEX IF NOT EXISTS idx_zones_geom ON zones USING GIST (points_geom)",
             "CREATE INDEX IF NOT EXISTS idx_zones_active ON zones(active) WHERE deleted_at IS NULL",
             "CREATE INDEX IF NOT EXISTS idx_zones_enabled ON zones(enabled) WHERE deleted_at IS NULL",
             "CREATE INDEX IF NOT EXISTS idx_zones_mode ON zones(mode)"
@@ -466,10 +1345,19 @@ async def init_database(force_recreate: bool = False) -> None:
         # Índices para performance
         for index_sql in [
             "CREATE INDEX IF NOT EXISTS idx_alerts_person ON alerts(person_id)",
-            "CREATE INDEX IF NOT EXISTS idx_alerts_created ON alerts(created_at DESC)",
+            # Covering index: get_recent_alerts(summary=True) vira index-only scan
+            "DROP INDEX IF EXISTS idx_alerts_created",
+            """
+            CREATE INDEX IF NOT EXISTS idx_alerts_created_cover ON alerts(created_at DESC)
+            INCLUDE (id, person_id, zone_id, zone_name, severity, resolved_at)
+            """,
             "CREATE INDEX IF NOT EXISTS idx_alerts_zone ON alerts(zone_id)",
             "CREATE INDEX IF NOT EXISTS idx_alerts_severity ON alerts(severity)",
-            "CREATE INDEX IF NOT EXISTS idx_alerts_resolved ON alerts(resolved_at)"
+            "CREATE INDEX IF NOT EXISTS idx_alerts_resolved ON alerts(resolved_at)",
+            # Partial indexes para os predicados quentes
+            "CREATE INDEX IF NOT EXISTS idx_alerts_unresolved ON alerts(created_at DESC) WHERE resolved_at IS NULL",
+            "CREATE INDEX IF NOT EXISTS idx_alerts_high_recent ON alerts(created_at DESC) WHERE severity IN ('high', 'critical')",
+            "CREATE INDEX IF NOT EXISTS idx_alerts_pending_email ON alerts(id) WHERE email_sent = FALSE"
         ]:
             await conn.execute(index_sql)
         
@@ -509,17 +1397,35 @@ async def init_database(force_recreate: bool = False) -> None:
         # ==================== SYSTEM LOGS TABLE ====================
         await conn.execute("""
             CREATE TABLE IF NOT EXISTS systemlogs (
-                id SERIAL PRIMARY KEY,
+                id SERIAL,
                 action VARCHAR(100) NOT NULL,
                 username VARCHAR(50),
                 reason TEXT,
-                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                timestamp TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
                 email_sent BOOLEAN DEFAULT FALSE,
                 ip_address VARCHAR(45),
                 user_agent TEXT,
                 context JSONB DEFAULT '{}'::jsonb,
-                session_id VARCHAR(100)
-            )
+                session_id VARCHAR(100),
+                PRIMARY KEY (id, timestamp)
+            ) PARTITION BY RANGE (timestamp)
+        """)
+        
+        # ✅ context sem chaves nulas, normalizado no servidor (vale também para COPY)
+        await conn.execute("""
+            CREATE OR REPLACE FUNCTION strip_context_nulls() RETURNS trigger
+            LANGUAGE plpgsql AS $$
+            BEGIN
+                NEW.context := jsonb_strip_nulls(COALESCE(NEW.context, '{}'::jsonb));
+                RETURN NEW;
+            END
+            $$
+        """)
+        await conn.execute("DROP TRIGGER IF EXISTS trg_systemlogs_context ON systemlogs")
+        await conn.execute("""
+            CREATE TRIGGER trg_systemlogs_context
+            BEFORE INSERT ON systemlogs
+            FOR EACH ROW EXECUTE FUNCTION strip_context_nulls()
         """)
         
         for index_sql in [
@@ -533,7 +1439,7 @@ async def init_database(force_recreate: bool = False) -> None:
         # ==================== AUDIT LOGS TABLE ====================
         await conn.execute("""
             CREATE TABLE IF NOT EXISTS auditlogs (
-                id SERIAL PRIMARY KEY,
+                id SERIAL,
                 timestamp TIMESTAMP NOT NULL,
                 user_id VARCHAR(50) NOT NULL,
                 action VARCHAR(100) NOT NULL,
@@ -541,8 +1447,9 @@ async def init_database(force_recreate: bool = False) -> None:
                 ip_address VARCHAR(45),
                 previous_hash VARCHAR(64),
                 current_hash VARCHAR(64) NOT NULL,
-                context JSONB DEFAULT '{}'::jsonb
-            )
+                context JSONB DEFAULT '{}'::jsonb,
+                PRIMARY KEY (id, timestamp)
+            ) PARTITION BY RANGE (timestamp)
         """)
         
         await conn.execute("""
@@ -565,9 +1472,13 @@ async def init_database(force_recreate: bool = False) -> None:
             )
         """)
         
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_conversations_session ON conversations(session_id)
-        """)
+        # (session_id, timestamp) serve o histórico ordenado + LIMIT sem Sort
+        # (o btree é percorrido em qualquer direção)
+        for index_sql in [
+            "DROP INDEX IF EXISTS idx_conversations_session",
+            "CREATE INDEX IF NOT EXISTS idx_conversations_session_ts ON conversations(session_id, timestamp DESC)"
+        ]:
+            await conn.execute(index_sql)
         
         logger.info("✅ Tabela 'conversations' criada")
         
@@ -586,14 +1497,27 @@ async def init_database(force_recreate: bool = False) -> None:
             )
         """)
         
+        # Full-text search: tsvector persistido + GIN (substitui ILIKE '%q%')
+        await conn.execute("""
+            ALTER TABLE knowledgebase ADD COLUMN IF NOT EXISTS content_tsv tsvector
+            GENERATED ALWAYS AS (
+                to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(content, ''))
+            ) STORED
+        """)
+        for index_sql in [
+            "CREATE INDEX IF NOT EXISTS idx_kb_tsv ON knowledgebase USING GIN (content_tsv)",
+            "CREATE INDEX IF NOT EXISTS idx_kb_category ON knowledgebase(category)"
+        ]:
+            await conn.execute(index_sql)
+        
         logger.info("✅ Tabela 'knowledgebase' criada")
         
         # ==================== DETECTIONS TABLE (YOLO) ====================
         await conn.execute("""
             CREATE TABLE IF NOT EXISTS detections (
-                id SERIAL PRIMARY KEY,
+                id SERIAL,
                 track_id INTEGER NOT NULL,
-                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                timestamp TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
                 zone_index INTEGER,
                 zone_name VARCHAR(100),
                 zone_id INTEGER REFERENCES zones(id) ON DELETE SET NULL,
@@ -601,90 +1525,231 @@ async def init_database(force_recreate: bool = False) -> None:
                 bbox JSONB,
                 status VARCHAR(20),
                 duration_seconds REAL,
-                metadata JSONB DEFAULT '{}'::jsonb
-            )
+                metadata JSONB DEFAULT '{}'::jsonb,
+                PRIMARY KEY (id, timestamp)
+            ) PARTITION BY RANGE (timestamp)
         """)
         
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_detections_track ON detections(track_id)
-        """)
+        # (track_id, timestamp DESC) atende "últimas detecções do track"
+        # sem nó de Sort; INCLUDE permite index-only scan das colunas quentes.
+        # Predicados com now() não são IMMUTABLE (não servem para índice
+        # parcial); o recorte "recente" vem do partition pruning mensal.
+        for index_sql in [
+            "DROP INDEX IF EXISTS idx_detections_track",
+            """
+            CREATE INDEX IF NOT EXISTS idx_detections_track_ts
+            ON detections(track_id, timestamp DESC)
+            INCLUDE (zone_id, status, confidence)
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_detections_recent ON detections(timestamp DESC)"
+        ]:
+            await conn.execute(index_sql)
         
         logger.info("✅ Tabela 'detections' criada")
         
         await conn.commit()
         logger.info("✅ Database tables initialized (v3.0 - 100% API ALIGNED)")
         
+        # ✅ Partições mensais (detections / systemlogs / auditlogs)
+        await ensure_partitions()
+        
         # ✅ Create default zone if needed
-        async with conn.cursor() as cur:
-            await cur.execute(SQL.COUNT_ZONES)
-            result = await cur.fetchone()
-            
-            if result['count'] == 0:
-                logger.info("📍 Creating default zone...")
-                await cur.execute(
-                    """
-                    INSERT INTO zones (
-                        name, mode, points, empty_timeout, full_timeout,
-                        empty_threshold, full_threshold, enabled, active
-                    )
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    """,
-                    (
-                        "Zona Principal",
-                        "occupancy",
-                        json.dumps([[100, 100], [500, 100], [500, 400], [100, 400]]),
-                        5.0, 10.0, 0, 3, True, True
-                    )
+        result = await (await conn.execute(SQL.ANY_ZONE_EXISTS)).fetchone()
+        
+        if result is None:
+            logger.info("📍 Creating default zone...")
+            await conn.execute(
+                """
+                INSERT INTO zones (
+                    name, mode, points, empty_timeout, full_timeout,
+                    empty_threshold, full_threshold, enabled, active
                 )
-                await conn.commit()
-                logger.info("✅ Default zone created")
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                """,
+                (
+                    "Zona Principal",
+                    "occupancy",
+                    Jsonb([[100, 100], [500, 100], [500, 400], [100, 400]]),
+                    5.0, 10.0, 0, 3, True, True
+                )
+            )
+            await conn.commit()
+            logger.info("✅ Default zone created")
         
         await sync_zones_to_settings()
+        
+        # Aquece o cache de zonas ativas: a primeira leitura do yolo.py
+        # já não vai ao banco
+        await get_all_zones(active_only=True)
 
 
 # ============================================
-# ZONES FUNCTIONS v3.0 ✅ RESTORED!
+# PARTITION MAINTENANCE
 # ============================================
 
-async def sync_zones_to_settings() -> bool:
+async def _is_partitioned(conn: psycopg.AsyncConnection, table: str) -> bool:
+    """Verifica se a tabela existente é particionada (tabelas legadas não são)"""
+    cur = await conn.execute(
+        "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)",
+        (table,)
+    )
+    return await cur.fetchone() is not None
+
+
+async def ensure_partitions(months_ahead: int = PARTITION_MONTHS_AHEAD) -> None:
     """
-    ✅ CRITICAL FUNCTION RESTORED!
+    Cria partições mensais (mês corrente + `months_ahead`) e a partição DEFAULT
     
-    Sincroniza tabela zones -> settings.safe_zone (JSON).
-    Mantém compatibilidade com yolo.py que lê de settings.safe_zone.
+    Args:
+        months_ahead: Quantos meses futuros pré-criar
     """
-    try:
-        zones = await _execute_query(SQL.SELECT_ACTIVE_ZONES, fetch="all")
-        
-        zones_data = []
-        for zone in zones:
-            zone_dict = {
-                "name": zone['name'],
-                "mode": zone['mode'],
-                "points": _parse_json_field(zone['points']),
-            }
+    pool = await get_db_pool()
+    today = date.today()
+    
+    async with pool.connection() as conn:
+        for table in PARTITIONED_TABLES:
+            table_name = table.value
             
-            # Add optional configs
-            for key in ['max_out_time', 'email_cooldown', 'empty_timeout', 
-                        'full_timeout', 'empty_threshold', 'full_threshold']:
-                if zone.get(key) is not None:
-                    zone_dict[key] = zone[key]
+            if not await _is_partitioned(conn, table_name):
+                logger.warning(f"⚠️ '{table_name}' is not partitioned (legacy table), skipping")
+                continue
             
-            zones_data.append(zone_dict)
-        
-        json_str = json.dumps(zones_data)
+            await conn.execute(
+                sql.SQL("CREATE TABLE IF NOT EXISTS {} PARTITION OF {} DEFAULT").format(
+                    sql.Identifier(f"{table_name}_default"), sql.Identifier(table_name)
+                )
+            )
+            
+            for offset in range(months_ahead + 1):
+                start = _month_start(today.year, today.month, offset)
+                end = _month_start(today.year, today.month, offset + 1)
+                partition = _partition_name(table_name, start)
+                try:
+                    await conn.execute(
+                        sql.SQL(
+                            "CREATE TABLE IF NOT EXISTS {} PARTITION OF {} "
+                            "FOR VALUES FROM ({}) TO ({})"
+                        ).format(
+                            sql.Identifier(partition), sql.Identifier(table_name),
+                            sql.Literal(start.isoformat()), sql.Literal(end.isoformat())
+                        )
+                    )
+                    await conn.commit()
+                except psycopg.Error as e:
+                    await conn.rollback()
+                    logger.warning(f"⚠️ Could not create partition {partition}: {e}")
         
-        await _execute_query(
+        await conn.commit()
+    
+    logger.info(f"✅ Monthly partitions ensured (+{months_ahead} months)")
+
+
+async def partition_maintenance_loop(
+    interval: float = PARTITION_MAINTENANCE_INTERVAL
+) -> None:
+    """
+    ✅ Mantém as partições futuras criadas enquanto a app roda
+    
+    init_database só cria mês corrente + PARTITION_MONTHS_AHEAD; sem isso,
+    um processo de vida longa passaria a gravar na partição DEFAULT.
+    Rodar como task em background (cancelar no shutdown).
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await ensure_partitions()
+        except Exception as e:
+            logger.error(f"❌ Partition maintenance failed: {e}")
+
+
+async def drop_old_partitions(table: TableName, keep_months: int) -> List[str]:
+    """
+    Remove partições mensais mais antigas que `keep_months` (DETACH + DROP, O(1))
+    
+    Args:
+        table: Tabela particionada
+        keep_months: Meses a manter (incluindo o corrente)
+    
+    Returns:
+        Nomes das partições removidas
+    """
+    table_name = table.value if hasattr(table, 'value') else table
+    today = date.today()
+    cutoff = _partition_name(table_name, _month_start(today.year, today.month, -(keep_months - 1)))
+    prefix = f"{table_name}_"
+    dropped = []
+    
+    pool = await get_db_pool()
+    async with pool.connection() as conn:
+        cur = await conn.execute(
             """
-            INSERT INTO settings (key, value, updated_by)
-            VALUES (%s, %s, %s)
-            ON CONFLICT (key) DO UPDATE 
-            SET value = %s, updated_at = CURRENT_TIMESTAMP, updated_by = %s
+            SELECT c.relname AS name
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = to_regclass(%s)
             """,
-            ("safe_zone", json_str, "system", json_str, "system")
+            (table_name,)
         )
+        for row in await cur.fetchall():
+            name = row['name']
+            suffix = name[len(prefix):]
+            # Só partições mensais <tabela>_YYYY_MM (nunca a DEFAULT)
+            if not name.startswith(prefix) or len(suffix) != 7 or not suffix.replace("_", "").isdigit():
+                continue
+            if name < cutoff:
+                await conn.execute(
+                    sql.SQL("ALTER TABLE {} DETACH PARTITION {}").format(
+                        sql.Identifier(table_name), sql.Identifier(name)
+                    )
+                )
+                await conn.execute(sql.SQL("DROP TABLE {}").format(sql.Identifier(name)))
+                dropped.append(name)
         
-        logger.info(f"✅ Synced {len(zones)} zones to settings.safe_zone")
+        await conn.commit()
+    
+    if dropped:
+        logger.info(f"🗑️ Dropped {len(dropped)} old partitions from {table_name}: {dropped}")
+    return dropped
+
+
+# ============================================
+# ZONES FUNCTIONS v3.0 ✅ RESTORED!
+# ============================================
+
+def _invalidate_zone_cache() -> None:
+    """Descarta zonas ativas e safe_zone do cache de leitura"""
+    _read_cache.invalidate(
+        _CACHE_ACTIVE_ZONES, _CACHE_ALL_SETTINGS,
+        _setting_cache_key("safe_zone"), _setting_json_cache_key("safe_zone")
+    )
+
+
+async def sync_zones_to_settings(conn: Optional[psycopg.AsyncConnection] = None) -> bool:
+    """
+    ✅ CRITICAL FUNCTION RESTORED!
+    
+    Sincroniza tabela zones -> settings.safe_zone (JSON).
+    Mantém compatibilidade com yolo.py que lê de settings.safe_zone.
+    
+    ✅ JSON agregado no Postgres (SQL.SYNC_SAFE_ZONE): 1 round-trip.
+    create_zone/update_zone/delete_zone já sincronizam no mesmo statement.
+    
+    Args:
+        conn: Conexão do caller. Se informada, o sync + COMMIT são
+            enfileirados na transação (e no pipeline, se ativo) do caller,
+            sem round-trip próprio; erros são propagados.
+    """
+    if conn is not None:
+        await conn.execute(SQL.SYNC_SAFE_ZONE)
+        await conn.commit()
+        _invalidate_zone_cache()
+        return True
+    
+    try:
+        row = await _execute_query(SQL.SYNC_SAFE_ZONE, fetch="one")
+        _invalidate_zone_cache()
+        
+        logger.info(f"✅ Synced {row['zone_count']} zones to settings.safe_zone")
         return True
         
     except Exception as e:
@@ -692,6 +1757,17 @@ async def sync_zones_to_settings() -> bool:
         return False
 
 
+def schedule_zone_sync() -> None:
+    """
+    ✅ Versão debounced de sync_zones_to_settings()
+    
+    Rajadas de edições (ex.: várias zonas alteradas pela UI) viram um
+    único sync a cada ZONE_SYNC_DEBOUNCE segundos. Use quando a escrita
+    já foi commitada e não há conexão para sincronizar na mesma transação.
+    """
+    _zone_sync_trigger.trigger()
+
+
 async def create_zone(
     name: str,
     mode: str,
@@ -706,20 +1782,12 @@ async def create_zone(
     active: bool = True,
     description: Optional[str] = None
 ) -> int:
-    """Cria nova zona (v3.0)"""
+    """Cria nova zona (v3.0) e sincroniza safe_zone na mesma transação"""
     try:
         result = await _execute_query(
-            """
-            INSERT INTO zones (
-                name, mode, points, max_out_time, email_cooldown,
-                empty_timeout, full_timeout, empty_threshold, full_threshold,
-                enabled, active, description
-            )
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            RETURNING id
-            """,
+            SQL.INSERT_ZONE_AND_SYNC,
             (
-                name, mode, json.dumps(points), max_out_time, email_cooldown,
+                name, mode, Jsonb(points), max_out_time, email_cooldown,
                 empty_timeout, full_timeout, empty_threshold, full_threshold,
                 enabled, active, description
             ),
@@ -727,7 +1795,7 @@ async def create_zone(
         )
         
         zone_id = result['id']
-        await sync_zones_to_settings()
+        _invalidate_zone_cache()
         
         logger.info(f"✅ Zone created: {name} (ID: {zone_id})")
         return zone_id
@@ -738,24 +1806,36 @@ async def create_zone(
 
 
 async def get_all_zones(active_only: bool = False) -> List[Dict[str, Any]]:
-    """Retorna todas as zonas"""
-    query = SQL.SELECT_ACTIVE_ZONES if active_only else SQL.SELECT_ALL_ZONES
-    zones = await _execute_query(query, fetch="all")
+    """
+    Retorna todas as zonas
     
-    for zone in zones:
-        zone['points'] = _parse_json_field(zone['points'])
+    ✅ `points` (JSONB) já chega decodificado pelo driver (orjson)
+    ✅ active_only=True é servido pelo cache stale-while-revalidate
+    (invalidado em sync_zones_to_settings)
+    """
+    if not active_only:
+        return await _execute_query(SQL.SELECT_ALL_ZONES, fetch="all")
     
-    return zones
+    zones = await _read_cache.get(
+        _CACHE_ACTIVE_ZONES, lambda: _execute_query(SQL.SELECT_ACTIVE_ZONES, fetch="all")
+    )
+    return [dict(zone) for zone in zones]
 
 
 async def get_zone_by_id(zone_id: int) -> Optional[Dict[str, Any]]:
     """Busca zona por ID"""
-    zone = await _execute_query(SQL.SELECT_ZONE_BY_ID, (zone_id,), fetch="one")
-    
-    if zone:
-        zone['points'] = _parse_json_field(zone['points'])
+    return await _execute_query(SQL.SELECT_ZONE_BY_ID, (zone_id,), fetch="one")
+
+
+async def get_zones_containing_point(x: float, y: float) -> List[Dict[str, Any]]:
+    """
+    Retorna zonas ativas que contêm o ponto (x, y)
     
-    return zone
+    ✅ Point-in-polygon no servidor: GiST (idx_zones_geom) pré-filtra, @> point confirma
+    """
+    return await _execute_query(
+        SQL.SELECT_ZONES_CONTAINING_POINT, {"x": x, "y": y}, fetch="all"
+    )
 
 
 async def update_zone(
@@ -773,45 +1853,40 @@ async def update_zone(
     active: Optional[bool] = None,
     description: Optional[str] = None
 ) -> bool:
-    """Atualiza zona existente (v3.0)"""
+    """
+    Atualiza zona existente (v3.0)
+    
+    ✅ Merge com os valores atuais feito no servidor (update_zone_partial):
+    sem SELECT prévio, sem janela de corrida, 1 round-trip com o sync
+    """
     try:
-        zone = await get_zone_by_id(zone_id)
-        if not zone:
+        # Só os campos informados; o resto mantém o valor atual
+        fields = {
+            key: value for key, value in {
+                "name": name,
+                "mode": mode,
+                "points": points,
+                "max_out_time": max_out_time,
+                "email_cooldown": email_cooldown,
+                "empty_timeout": empty_timeout,
+                "full_timeout": full_timeout,
+                "empty_threshold": empty_threshold,
+                "full_threshold": full_threshold,
+                "enabled": enabled,
+                "active": active,
+                "description": description,
+            }.items()
+            if value is not None
+        }
+        
+        # description & cia. não aparecem no safe_zone: pula o re-sync
+        query = SQL.UPDATE_ZONE_AND_SYNC if ZONE_SYNC_FIELDS & fields.keys() else SQL.UPDATE_ZONE
+        result = await _execute_query(query, (zone_id, Jsonb(fields)), fetch="one")
+        _invalidate_zone_cache()
+        if result is None:
             logger.warning(f"⚠️ Zone not found (ID: {zone_id})")
             return False
         
-        # Merge values (keep current if None)
-        updated_values = (
-            name or zone['name'],
-            mode or zone['mode'],
-            json.dumps(points if points is not None else zone['points']),
-            max_out_time if max_out_time is not None else zone.get('max_out_time'),
-            email_cooldown if email_cooldown is not None else zone.get('email_cooldown'),
-            empty_timeout if empty_timeout is not None else zone.get('empty_timeout'),
-            full_timeout if full_timeout is not None else zone.get('full_timeout'),
-            empty_threshold if empty_threshold is not None else zone.get('empty_threshold'),
-            full_threshold if full_threshold is not None else zone.get('full_threshold'),
-            enabled if enabled is not None else zone['enabled'],
-            active if active is not None else zone['active'],
-            description if description is not None else zone.get('description'),
-            zone_id
-        )
-        
-        await _execute_query(
-            """
-            UPDATE zones SET
-                name = %s, mode = %s, points = %s,
-                max_out_time = %s, email_cooldown = %s,
-                empty_timeout = %s, full_timeout = %s,
-                empty_threshold = %s, full_threshold = %s,
-                enabled = %s, active = %s, description = %s,
-                updated_at = CURRENT_TIMESTAMP
-            WHERE id = %s
-            """,
-            updated_values
-        )
-        
-        await sync_zones_to_settings()
         logger.info(f"✅ Zone updated (ID: {zone_id})")
         return True
         
@@ -827,16 +1902,18 @@ async def delete_zone(zone_id: int, soft: bool = True) -> bool:
     Args:
         zone_id: ID da zona
         soft: Se True, soft delete (mantém registro). Se False, hard delete (remove)
+    
+    ✅ Delete + sync do safe_zone em um único statement
     """
     try:
-        if soft:
-            await _execute_query(SQL.DELETE_ZONE_SOFT, (zone_id,))
-            logger.info(f"✅ Zone deleted (soft) (ID: {zone_id})")
-        else:
-            await _execute_query(SQL.DELETE_ZONE_HARD, (zone_id,))
-            logger.info(f"✅ Zone deleted (hard) (ID: {zone_id})")
+        query = SQL.DELETE_ZONE_SOFT_AND_SYNC if soft else SQL.DELETE_ZONE_HARD_AND_SYNC
+        result = await _execute_query(query, (zone_id,), fetch="one")
+        _invalidate_zone_cache()
+        if result is None:
+            logger.warning(f"⚠️ Zone not found (ID: {zone_id})")
+            return False
         
-        await sync_zones_to_settings()
+        logger.info(f"✅ Zone deleted ({'soft' if soft else 'hard'}) (ID: {zone_id})")
         return True
         
     except Exception as e:
@@ -849,18 +1926,35 @@ async def delete_zone(zone_id: int, soft: bool = True) -> bool:
 # ============================================
 
 async def get_user_by_username(username: str) -> Optional[Dict[str, Any]]:
-    """Busca usuário por username"""
-    return await _execute_query(SQL.SELECT_USER_BY_USERNAME, (username,), fetch="one")
+    """Busca usuário por username (✅ TTL cache)"""
+    return await _user_cache.get(
+        "username", username,
+        lambda: _execute_query(SQL.SELECT_USER_BY_USERNAME, (username,), fetch="one")
+    )
+
+
+async def get_active_user_by_username(username: str) -> Optional[Dict[str, Any]]:
+    """Busca usuário ativo (is_active e não disabled) por username (✅ TTL cache)"""
+    return await _user_cache.get(
+        "active_username", username,
+        lambda: _execute_query(SQL.SELECT_ACTIVE_USER_BY_USERNAME, (username,), fetch="one")
+    )
 
 
 async def get_user_by_email(email: str) -> Optional[Dict[str, Any]]:
-    """Busca usuário por email"""
-    return await _execute_query(SQL.SELECT_USER_BY_EMAIL, (email,), fetch="one")
+    """Busca usuário por email (✅ TTL cache)"""
+    return await _user_cache.get(
+        "email", email,
+        lambda: _execute_query(SQL.SELECT_USER_BY_EMAIL, (email,), fetch="one")
+    )
 
 
 async def get_user_by_id(user_id: int) -> Optional[Dict[str, Any]]:
-    """Busca usuário por ID"""
-    return await _execute_query(SQL.SELECT_USER_BY_ID, (user_id,), fetch="one")
+    """Busca usuário por ID (✅ TTL cache)"""
+    return await _user_cache.get(
+        "id", user_id,
+        lambda: _execute_query(SQL.SELECT_USER_BY_ID, (user_id,), fetch="one")
+    )
 
 
 async def create_user(
@@ -874,30 +1968,31 @@ async def create_user(
     is_active: bool = True,
     account_status: str = "active"
 ) -> bool:
-    """Cria novo usuário (v3.0)"""
+    """
+    Cria novo usuário (v3.0)
+    
+    ✅ ON CONFLICT DO NOTHING: username/email duplicado é um no-op
+    (sem UniqueViolation, sem transação abortada)
+    """
     try:
-        await _execute_query(
-            """
-            INSERT INTO users (
-                username, email, password_hash, role, 
-                full_name, phone, email_verified, is_active, account_status,
-                metadata, preferences
-            )
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """,
+        row = await _execute_query(
+            SQL.INSERT_USER,
             (
                 username, email, password_hash, role,
                 full_name, phone, email_verified, is_active, account_status,
                 "{}", "{}"
-            )
+            ),
+            fetch="one"
         )
+        if row is None:
+            logger.warning(f"⚠️ User already exists: {username}")
+            return False
+        
+        _user_cache.invalidate(username=username)
         logger.info(f"✅ User created: {username}")
         return True
         
-    except psycopg.errors.UniqueViolation:
-        logger.warning(f"⚠️ User already exists: {username}")
-        return False
-    except Exception as e:
+    except psycopg.Error as e:
         logger.error(f"❌ Error creating user: {e}")
         return False
 
@@ -906,57 +2001,146 @@ async def update_user(
     user_id: int,
     **kwargs
 ) -> bool:
-    """Atualiza usuário (v3.0) - aceita qualquer campo"""
+    """Atualiza usuário (v3.0) - aceita campos de USER_UPDATABLE_COLUMNS"""
     try:
         if not kwargs:
             return False
         
-        # Build dynamic UPDATE query
-        update_fields = []
-        params = []
+        unknown = kwargs.keys() - USER_UPDATABLE_COLUMNS
+        if unknown:
+            logger.warning(f"⚠️ Invalid user fields rejected: {sorted(unknown)}")
+            return False
         
-        for key, value in kwargs.items():
-            if key in ['preferences', 'metadata'] and isinstance(value, dict):
-                value = json.dumps(value)
-            update_fields.append(f"{key} = %s")
+        columns = tuple(sorted(kwargs))
+        params = []
+        for key in columns:
+            value = kwargs[key]
+            if key in ('preferences', 'metadata') and isinstance(value, dict):
+                value = Jsonb(value)
             params.append(value)
-        
-        update_fields.append("updated_at = CURRENT_TIMESTAMP")
         params.append(user_id)
         
-        query = f"UPDATE users SET {', '.join(update_fields)} WHERE id = %s"
-        await _execute_query(query, tuple(params))
+        updated = await _execute_query(
+            _build_update_sql(TableName.USERS.value, columns), tuple(params), fetch="rowcount"
+        )
+        _user_cache.invalidate(user_id=user_id)
         
-        logger.info(f"✅ User updated (ID: {user_id})")
-        return True
+        if updated:
+            logger.info(f"✅ User updated (ID: {user_id})")
+        return updated > 0
         
-    except Exception as e:
+    except psycopg.Error as e:
         logger.error(f"❌ Error updating user: {e}")
         return False
 
 
+_pending_logins: Dict[str, float] = {}
+_last_login_recorded: Dict[str, float] = {}
+
+
 async def update_last_login(username: str) -> None:
-    """Atualiza timestamp do último login"""
-    await _execute_query(SQL.UPDATE_LAST_LOGIN, (username,))
+    """
+    Atualiza timestamp do último login
+    
+    ✅ Coalescido: registra o horário em memória e um único UPDATE
+    (unnest) grava todos os logins da janela LAST_LOGIN_FLUSH_INTERVAL.
+    ✅ Throttle: no máximo um registro por usuário a cada
+    LAST_LOGIN_MIN_INTERVAL (last_login tem essa resolução).
+    """
+    now = time.time()
+    if now - _last_login_recorded.get(username, 0.0) < LAST_LOGIN_MIN_INTERVAL:
+        return
+    _last_login_recorded[username] = now
+    _pending_logins[username] = now
+    _last_login_trigger.trigger()
+
+
+async def flush_last_logins() -> None:
+    """Grava imediatamente os logins pendentes (1 UPDATE para todos)"""
+    global _pending_logins
+    # Entradas fora da janela de throttle não bloqueiam mais nada: descarta
+    # para o dict não crescer com todo usuário que já fez login
+    cutoff = time.time() - LAST_LOGIN_MIN_INTERVAL
+    for username in [u for u, ts in _last_login_recorded.items() if ts <= cutoff]:
+        del _last_login_recorded[username]
+    if not _pending_logins:
+        return
+    pending, _pending_logins = _pending_logins, {}
+    await _execute_query(
+        SQL.UPDATE_LAST_LOGIN_BATCH, (list(pending.keys()), list(pending.values()))
+    )
+    for username in pending:
+        _user_cache.invalidate(username=username)
+
+
+_last_login_trigger = _CoalescingTrigger(
+    "last-login", flush_last_logins, LAST_LOGIN_FLUSH_INTERVAL
+)
+
+
+async def get_all_users(include_credentials: bool = False) -> List[Dict[str, Any]]:
+    """
+    Retorna todos os usuários (admin only)
+    
+    ✅ Sem password_hash / mfa_secret, a menos que include_credentials=True
+    (backup em recreate_db.py). Para listagens paginadas use get_users_page().
+    """
+    query = SQL.SELECT_ALL_USERS_FULL if include_credentials else SQL.SELECT_ALL_USERS
+    return await _execute_query(query, fetch="all")
+
+
+async def iter_all_users() -> AsyncIterator[Dict[str, Any]]:
+    """
+    ✅ Itera todos os usuários sem materializar a lista (exports)
+    
+    Cursor server-side (named portal): as linhas chegam em blocos de
+    USER_STREAM_ITERSIZE, memória constante independente do tamanho da tabela.
+    Mesmas colunas de get_all_users() (sem credenciais).
+    
+    ⚠️ Consuma com contextlib.aclosing(): um consumidor que para no meio
+    manteria a conexão e o cursor abertos até o GC finalizar o gerador.
+    """
+    pool = await get_db_pool()
+    async with pool.connection() as conn:
+        async with conn.cursor(name="iter_all_users") as cur:
+            cur.itersize = USER_STREAM_ITERSIZE
+            await cur.execute(SQL.SELECT_ALL_USERS)
+            async for row in cur:
+                yield row
 
 
-async def get_all_users() -> List[Dict[str, Any]]:
-    """Retorna todos os usuários (admin only)"""
-    return await _execute_query(SQL.SELECT_ALL_USERS, fetch="all")
+async def get_users_page(
+    limit: int = 200,
+    before: Optional[Tuple[datetime, int]] = None
+) -> List[Dict[str, Any]]:
+    """
+    ✅ Página de usuários via keyset pagination (mais recentes primeiro)
+    
+    Args:
+        limit: Tamanho da página
+        before: (created_at, id) da última linha da página anterior
+    """
+    if before is None:
+        return await _execute_query(SQL.SELECT_USERS_PAGE, (limit,), fetch="all")
+    return await _execute_query(SQL.SELECT_USERS_PAGE_BEFORE, (*before, limit), fetch="all")
 
 
 async def delete_user(user_id: int) -> bool:
     """Deleta usuário por ID"""
-    return await _execute_delete(TableName.USERS, user_id)
+    deleted = await _execute_delete(TableName.USERS, user_id)
+    _user_cache.invalidate(user_id=user_id)
+    return deleted
 
 
 async def update_user_role(user_id: int, role: str) -> bool:
     """Atualiza role do usuário"""
     try:
-        await _execute_query(SQL.UPDATE_USER_ROLE, (role, user_id))
-        logger.info(f"✅ User role updated (ID: {user_id}) -> {role}")
-        return True
-    except Exception as e:
+        updated = await _execute_query(SQL.UPDATE_USER_ROLE, (role, user_id), fetch="rowcount")
+        _user_cache.invalidate(user_id=user_id)
+        if updated:
+            logger.info(f"✅ User role updated (ID: {user_id}) -> {role}")
+        return updated > 0
+    except psycopg.Error as e:
         logger.error(f"❌ Error updating user role: {e}")
         return False
 
@@ -965,10 +2149,32 @@ async def update_user_role(user_id: int, role: str) -> bool:
 # SETTINGS FUNCTIONS v3.0
 # ============================================
 
-async def get_setting(key: str, default: Any = None) -> Any:
-    """Obtém configuração do banco"""
+async def _load_setting(key: str) -> Optional[str]:
     row = await _execute_query(SQL.SELECT_SETTING, (key,), fetch="one")
-    return row['value'] if row else default
+    return row['value'] if row else None
+
+
+async def get_setting(key: str, default: Any = None) -> Any:
+    """Obtém configuração do banco (✅ cache stale-while-revalidate)"""
+    value = await _read_cache.get(_setting_cache_key(key), lambda: _load_setting(key))
+    return value if value is not None else default
+
+
+async def _load_setting_json(key: str) -> Any:
+    row = await _execute_query(SQL.SELECT_SETTING_JSON, (key,), fetch="one")
+    return row['value_json'] if row else None
+
+
+async def get_setting_json(key: str, default: Any = None) -> Any:
+    """
+    Obtém configuração JSON já decodificada (ex.: safe_zone)
+    
+    ✅ Lê settings.value_json (JSONB): list/dict direto do driver,
+    sem json.loads. Retorna `default` se a chave não existir ou o
+    valor não for JSON válido.
+    """
+    value = await _read_cache.get(_setting_json_cache_key(key), lambda: _load_setting_json(key))
+    return value if value is not None else default
 
 
 async def set_setting(
@@ -979,41 +2185,115 @@ async def set_setting(
     data_type: str = "string",
     description: Optional[str] = None
 ) -> None:
-    """Salva configuração no banco com histórico (v3.0)"""
-    old_value = await get_setting(key)
-    history_entry = _create_history_entry(old_value, value, updated_by)
+    """
+    Salva configuração no banco com histórico (v3.0)
     
+    ✅ Single round-trip: valor antigo e entrada de histórico
+    são resolvidos dentro do Postgres (SQL.UPSERT_SETTING)
+    """
     await _execute_query(
-        """
-        INSERT INTO settings (
-            key, value, updated_at, updated_by, 
-            category, data_type, description, change_history
-        )
-        VALUES (%s, %s, CURRENT_TIMESTAMP, %s, %s, %s, %s, %s::jsonb)
-        ON CONFLICT (key) DO UPDATE 
-        SET value = %s, 
-            updated_at = CURRENT_TIMESTAMP, 
-            updated_by = %s,
-            category = %s,
-            data_type = %s,
-            description = COALESCE(%s, settings.description),
-            change_history = settings.change_history || %s::jsonb
-        """,
-        (
-            key, str(value), updated_by, category, data_type, description,
-            json.dumps([history_entry]),
-            str(value), updated_by, category, data_type, description,
-            json.dumps([history_entry])
-        )
+        SQL.UPSERT_SETTING,
+        {
+            "key": key,
+            "value": str(value),
+            "updated_by": updated_by,
+            "category": category,
+            "data_type": data_type,
+            "description": description,
+        }
+    )
+    _read_cache.invalidate(
+        _setting_cache_key(key), _setting_json_cache_key(key), _CACHE_ALL_SETTINGS
     )
 
 
-async def get_all_settings() -> Dict[str, Any]:
-    """Retorna todas as configurações"""
+async def set_settings_bulk(
+    items: Dict[str, Any],
+    updated_by: str = "system",
+    category: str = "other",
+    data_type: str = "string"
+) -> int:
+    """
+    ✅ Salva várias configurações de uma vez (pipeline mode, 1 commit)
+    
+    Mesmo UPSERT (com histórico) de set_setting(), enviado em lote numa
+    única conexão: N round trips viram 1. Retorna a quantidade gravada.
+    """
+    if not items:
+        return 0
+    
+    params = [
+        {
+            "key": key,
+            "value": str(value),
+            "updated_by": updated_by,
+            "category": category,
+            "data_type": data_type,
+            "description": None,
+        }
+        for key, value in items.items()
+    ]
+    
+    pool = await get_db_pool()
+    async with pool.connection() as conn:
+        async with conn.pipeline():
+            async with conn.cursor() as cur:
+                await cur.executemany(SQL.UPSERT_SETTING, params)
+        await conn.commit()
+    
+    _read_cache.invalidate(
+        _CACHE_ALL_SETTINGS,
+        *(_setting_cache_key(key) for key in items),
+        *(_setting_json_cache_key(key) for key in items)
+    )
+    return len(params)
+
+
+async def _load_all_settings() -> Dict[str, Any]:
     rows = await _execute_query(SQL.SELECT_ALL_SETTINGS, fetch="all")
     return {row['key']: row['value'] for row in rows}
 
 
+async def get_all_settings() -> Dict[str, Any]:
+    """Retorna todas as configurações (✅ cache stale-while-revalidate)"""
+    settings_map = await _read_cache.get(_CACHE_ALL_SETTINGS, _load_all_settings)
+    return dict(settings_map)
+
+
+def _invalidate_setting(key: str) -> None:
+    """Descarta uma chave (e a visão completa) do cache de leitura"""
+    if key == "safe_zone":
+        # safe_zone só muda junto com as zonas (sync_zones_to_settings)
+        _invalidate_zone_cache()
+        return
+    _read_cache.invalidate(
+        _setting_cache_key(key), _setting_json_cache_key(key), _CACHE_ALL_SETTINGS
+    )
+
+
+async def settings_change_listener() -> None:
+    """
+    ✅ LISTEN settings_changed: invalida o cache quando outro processo grava
+    
+    Conexão dedicada (fora do pool, autocommit). Ao (re)conectar descarta
+    todo o cache, pois notificações perdidas durante a queda não voltam.
+    Rodar como task em background (cancelar no shutdown).
+    """
+    db_url = _normalize_database_url(settings.DATABASE_URL)
+    while True:
+        try:
+            async with await psycopg.AsyncConnection.connect(db_url, autocommit=True) as conn:
+                await conn.execute(
+                    sql.SQL("LISTEN {}").format(sql.Identifier(SETTINGS_NOTIFY_CHANNEL))
+                )
+                _read_cache.invalidate()
+                async for notify in conn.notifies():
+                    _invalidate_setting(notify.payload)
+        except psycopg.Error as e:
+            logger.warning(f"⚠️ Settings listener disconnected: {e}")
+            await asyncio.sleep(SETTINGS_LISTEN_RETRY)
+
+
 # ============================================
 # SYSTEM LOGS FUNCTIONS
 # ============================================
@@ -1028,23 +2308,65 @@ async def log_system_action(
     context: Optional[Dict[str, Any]] = None,
     session_id: Optional[str] = None
 ) -> None:
-    """Registra ação do sistema"""
-    await _execute_query(
-        """
-        INSERT INTO systemlogs 
-        (action, username, reason, email_sent, ip_address, user_agent, context, session_id)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-        """,
-        (
-            action, username, reason, email_sent, ip_address, user_agent,
-            _safe_json_dumps(context), session_id
-        )
+    """
+    Registra ação do sistema
+    
+    ✅ Write-behind: o log é enfileirado e gravado em lote via COPY
+    pelo flusher de _system_log_buffer. Use flush_system_logs() para forçar.
+    """
+    await _system_log_buffer.put(_system_log_row(
+        action, username, reason, email_sent, ip_address, user_agent,
+        context, session_id
+    ))
+
+
+def _system_log_row(
+    action: str,
+    username: str,
+    reason: Optional[str] = None,
+    email_sent: bool = False,
+    ip_address: Optional[str] = None,
+    user_agent: Optional[str] = None,
+    context: Optional[Dict[str, Any]] = None,
+    session_id: Optional[str] = None
+) -> Tuple:
+    """Monta a tupla de parâmetros de SQL.INSERT_SYSTEM_LOG / COPY_SYSTEM_LOGS"""
+    return (
+        action, username, reason, email_sent, ip_address, user_agent,
+        _safe_json_dumps(context), session_id
     )
 
 
-async def get_system_logs(limit: int = 50) -> List[Dict[str, Any]]:
-    """Obtém logs do sistema"""
-    return await _execute_query(SQL.SELECT_SYSTEM_LOGS, (limit,), fetch="all")
+async def log_system_actions_bulk(logs: List[Dict[str, Any]]) -> int:
+    """
+    ✅ Grava vários logs de sistema de uma vez (COPY, 1 commit)
+    
+    Cada item aceita os mesmos campos de log_system_action().
+    Retorna a quantidade de linhas gravadas.
+    """
+    if not logs:
+        return 0
+    await _system_log_buffer.write_batch([_system_log_row(**log) for log in logs])
+    return len(logs)
+
+
+async def flush_system_logs() -> None:
+    """Grava imediatamente os logs de sistema pendentes no buffer"""
+    await _system_log_buffer.flush()
+
+
+async def get_system_logs(
+    limit: int = 50,
+    before: Optional[Tuple[datetime, int]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Obtém logs do sistema (mais recentes primeiro)
+    
+    ✅ Keyset pagination: before = (timestamp, id) da última linha da página anterior
+    """
+    if before is None:
+        return await _execute_query(SQL.SELECT_SYSTEM_LOGS, (limit,), fetch="all")
+    return await _execute_query(SQL.SELECT_SYSTEM_LOGS_BEFORE, (*before, limit), fetch="all")
 
 
 # ============================================
@@ -1067,28 +2389,163 @@ async def log_alert(
     description: Optional[str] = None,
     metadata: Optional[Dict[str, Any]] = None
 ) -> None:
-    """Registra alerta (v3.0 - compatível com yolo.py)"""
-    await _execute_query(
-        """
-        INSERT INTO alerts (
-            person_id, out_time, snapshot_path, email_sent, notification_sent,
-            track_id, video_path, zone_index, zone_id, zone_name,
-            alert_type, severity, description, metadata
-        )
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """,
-        (
-            person_id, out_time, snapshot_path, email_sent, notification_sent,
-            track_id, video_path, zone_index, zone_id, zone_name,
-            alert_type, severity, description,
-            _safe_json_dumps(metadata)
-        )
+    """
+    Registra alerta (v3.0 - compatível com yolo.py)
+    
+    ✅ Write-behind: o alerta é enfileirado e gravado em lote (janela de
+    ALERT_BUFFER_FLUSH_INTERVAL) pelo flusher de _alert_buffer.
+    Use flush_alerts() para forçar a gravação.
+    """
+    await _alert_buffer.put(_alert_row(
+        person_id, out_time, snapshot_path, email_sent, notification_sent,
+        track_id, video_path, zone_index, zone_id, zone_name,
+        alert_type, severity, description, metadata
+    ))
+
+
+def _alert_row(
+    person_id: int,
+    out_time: float,
+    snapshot_path: Optional[str] = None,
+    email_sent: bool = False,
+    notification_sent: bool = False,
+    track_id: Optional[int] = None,
+    video_path: Optional[str] = None,
+    zone_index: Optional[int] = None,
+    zone_id: Optional[int] = None,
+    zone_name: Optional[str] = None,
+    alert_type: str = "zone_violation",
+    severity: str = "medium",
+    description: Optional[str] = None,
+    metadata: Optional[Dict[str, Any]] = None
+) -> Tuple:
+    """Monta a tupla de parâmetros de SQL.INSERT_ALERT"""
+    return (
+        person_id, out_time, snapshot_path, email_sent, notification_sent,
+        track_id, video_path, zone_index, zone_id, zone_name,
+        alert_type, severity, description,
+        _safe_json_dumps(metadata)
     )
 
 
-async def get_recent_alerts(limit: int = 20) -> List[Dict[str, Any]]:
-    """Obtém alertas recentes"""
-    return await _execute_query(SQL.SELECT_RECENT_ALERTS, (limit,), fetch="all")
+async def log_alerts_batch(alerts: List[Dict[str, Any]]) -> int:
+    """
+    Grava vários alertas de uma vez, sem passar pelo buffer
+    
+    ✅ Pipeline mode: todos os INSERTs são enviados sem esperar o ack
+    de cada um, em uma única transação.
+    
+    Args:
+        alerts: Lista de dicts com os mesmos argumentos de log_alert
+    
+    Returns:
+        Número de alertas gravados
+    """
+    if not alerts:
+        return 0
+    
+    await _alert_buffer.write_batch([_alert_row(**alert) for alert in alerts])
+    return len(alerts)
+
+
+async def log_alert_with_media(
+    person_id: int,
+    out_time: float,
+    snapshot: Optional[Awaitable[Optional[str]]] = None,
+    video: Optional[Awaitable[Optional[str]]] = None,
+    **alert_fields: Any
+) -> int:
+    """
+    Registra alerta imediatamente e anexa snapshot/vídeo depois
+    
+    ✅ O INSERT (paths = NULL) não espera o encoder/disco: `snapshot` e
+    `video` são awaitables que resolvem para o path final e são gravados
+    por um UPDATE em background (_attach_alert_media).
+    
+    Args:
+        person_id: ID da pessoa
+        out_time: Tempo fora da zona
+        snapshot: Awaitable que retorna o path do snapshot
+        video: Awaitable que retorna o path do vídeo
+        **alert_fields: Demais argumentos de log_alert
+    
+    Returns:
+        ID do alerta criado
+    """
+    row = await _execute_query(
+        SQL.INSERT_ALERT_RETURNING_ID,
+        _alert_row(person_id, out_time, **alert_fields),
+        fetch="one"
+    )
+    alert_id = row['id']
+    
+    if snapshot is not None or video is not None:
+        task = asyncio.create_task(_attach_alert_media(alert_id, snapshot, video))
+        _media_tasks.add(task)
+        task.add_done_callback(_media_tasks.discard)
+    
+    return alert_id
+
+
+_media_tasks: Set[asyncio.Task] = set()
+
+
+async def _await_optional(value: Optional[Awaitable[Optional[str]]]) -> Optional[str]:
+    return await value if value is not None else None
+
+
+async def _attach_alert_media(
+    alert_id: int,
+    snapshot: Optional[Awaitable[Optional[str]]],
+    video: Optional[Awaitable[Optional[str]]]
+) -> None:
+    """Aguarda os writers de mídia e grava os paths no alerta"""
+    try:
+        snapshot_path, video_path = await asyncio.gather(
+            _await_optional(snapshot), _await_optional(video)
+        )
+        if snapshot_path is None and video_path is None:
+            return
+        await _execute_query(SQL.UPDATE_ALERT_MEDIA, (snapshot_path, video_path, alert_id))
+    except Exception as e:
+        logger.error(f"❌ Error attaching media to alert {alert_id}: {e}")
+
+
+async def flush_alerts() -> None:
+    """Grava imediatamente os alertas pendentes (buffer + mídia em background)"""
+    await _alert_buffer.flush()
+    
+    loop = asyncio.get_running_loop()
+    pending = [task for task in _media_tasks if task.get_loop() is loop]
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def get_recent_alerts(
+    limit: int = 20,
+    summary: bool = False,
+    before: Optional[Tuple[datetime, int]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Obtém alertas recentes
+    
+    Args:
+        limit: Número máximo de alertas
+        summary: Se True, retorna só id/person_id/zone_id/zone_name/severity/
+            resolved_at/created_at, servidos direto de idx_alerts_created_cover
+        before: (created_at, id) da última linha da página anterior (keyset)
+    """
+    if before is None:
+        query = SQL.SELECT_RECENT_ALERTS_SUMMARY if summary else SQL.SELECT_RECENT_ALERTS
+        return await _execute_query(query, (limit,), fetch="all")
+    
+    query = SQL.SELECT_RECENT_ALERTS_SUMMARY_BEFORE if summary else SQL.SELECT_RECENT_ALERTS_BEFORE
+    return await _execute_query(query, (*before, limit), fetch="all")
+
+
+async def get_unresolved_alerts(limit: int = 20) -> List[Dict[str, Any]]:
+    """Obtém alertas não resolvidos mais recentes (idx_alerts_unresolved)"""
+    return await _execute_query(SQL.SELECT_UNRESOLVED_ALERTS, (limit,), fetch="all")
 
 
 async def delete_alert(alert_id: int) -> bool:
@@ -1100,31 +2557,34 @@ async def update_alert(
     alert_id: int,
     **kwargs
 ) -> bool:
-    """Atualiza alerta (v3.0) - aceita qualquer campo"""
+    """Atualiza alerta (v3.0) - aceita campos de ALERT_UPDATABLE_COLUMNS"""
     try:
         if not kwargs:
             return False
         
-        # Build dynamic UPDATE query
-        update_fields = []
-        params = []
+        unknown = kwargs.keys() - ALERT_UPDATABLE_COLUMNS
+        if unknown:
+            logger.warning(f"⚠️ Invalid alert fields rejected: {sorted(unknown)}")
+            return False
         
-        for key, value in kwargs.items():
+        columns = tuple(sorted(kwargs))
+        params = []
+        for key in columns:
+            value = kwargs[key]
             if key == 'metadata' and isinstance(value, dict):
-                value = json.dumps(value)
-            update_fields.append(f"{key} = %s")
+                value = Jsonb(value)
             params.append(value)
-        
-        update_fields.append("updated_at = CURRENT_TIMESTAMP")
         params.append(alert_id)
         
-        query = f"UPDATE alerts SET {', '.join(update_fields)} WHERE id = %s"
-        await _execute_query(query, tuple(params))
+        updated = await _execute_query(
+            _build_update_sql(TableName.ALERTS.value, columns), tuple(params), fetch="rowcount"
+        )
         
-        logger.info(f"✅ Alert updated (ID: {alert_id})")
-        return True
+        if updated:
+            logger.info(f"✅ Alert updated (ID: {alert_id})")
+        return updated > 0
         
-    except Exception as e:
+    except psycopg.Error as e:
         logger.error(f"❌ Error updating alert: {e}")
         return False
 
@@ -1144,23 +2604,62 @@ async def save_detection(
     duration_seconds: Optional[float] = None,
     metadata: Optional[Dict[str, Any]] = None
 ) -> None:
-    """Salva detecção YOLO (v3.0)"""
-    await _execute_query(
-        """
-        INSERT INTO detections (
-            track_id, zone_index, zone_id, zone_name, confidence,
-            bbox, status, duration_seconds, metadata
-        )
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """,
-        (
-            track_id, zone_index, zone_id, zone_name, confidence,
-            _safe_json_dumps(bbox), status, duration_seconds,
-            _safe_json_dumps(metadata)
-        )
+    """
+    Salva detecção YOLO (v3.0)
+    
+    ✅ Write-behind: a detecção é enfileirada e gravada em lote via COPY
+    pelo flusher de _detection_buffer. Use flush_detections() para forçar.
+    """
+    await _detection_buffer.put(_detection_row(
+        track_id, zone_index, zone_id, zone_name, confidence,
+        bbox, status, duration_seconds, metadata
+    ))
+
+
+def _detection_row(
+    track_id: int,
+    zone_index: Optional[int] = None,
+    zone_id: Optional[int] = None,
+    zone_name: Optional[str] = None,
+    confidence: Optional[float] = None,
+    bbox: Optional[Dict[str, Any]] = None,
+    status: str = "active",
+    duration_seconds: Optional[float] = None,
+    metadata: Optional[Dict[str, Any]] = None
+) -> Tuple:
+    """Monta a tupla de parâmetros de SQL.INSERT_DETECTION / COPY_DETECTIONS"""
+    return (
+        track_id, zone_index, zone_id, zone_name, confidence,
+        _safe_json_dumps(bbox), status, duration_seconds,
+        _safe_json_dumps(metadata)
     )
 
 
+async def save_detections_bulk(detections: List[Dict[str, Any]]) -> int:
+    """
+    Grava várias detecções de uma vez, sem passar pelo buffer
+    
+    ✅ COPY FROM STDIN (5-10x mais rápido que INSERT por linha);
+    lote de 1 cai no INSERT normal.
+    
+    Args:
+        detections: Lista de dicts com os mesmos argumentos de save_detection
+    
+    Returns:
+        Número de detecções gravadas
+    """
+    if not detections:
+        return 0
+    
+    await _detection_buffer.write_batch([_detection_row(**d) for d in detections])
+    return len(detections)
+
+
+async def flush_detections() -> None:
+    """Grava imediatamente as detecções pendentes no buffer"""
+    await _detection_buffer.flush()
+
+
 async def get_detections_by_track(track_id: int, limit: int = 100) -> List[Dict[str, Any]]:
     """Obtém detecções de um track específico"""
     return await _execute_query(SQL.SELECT_DETECTIONS_BY_TRACK, (track_id, limit), fetch="all")
@@ -1180,21 +2679,33 @@ async def save_conversation_message(
 ) -> None:
     """Salva mensagem de conversação para histórico"""
     await _execute_query(
-        """
-        INSERT INTO conversations (user_id, session_id, message, role, metadata, context)
-        VALUES (%s, %s, %s, %s, %s, %s)
-        """,
+        SQL.INSERT_CONVERSATION_MESSAGE,
         (
             user_id, session_id, message, role,
             _safe_json_dumps(metadata),
             _safe_json_dumps(context)
-        )
+        ),
+        prepare=True
     )
 
 
-async def get_conversation_history(session_id: str, limit: int = 50) -> List[Dict[str, Any]]:
-    """Recupera histórico de conversação"""
-    return await _execute_query(SQL.SELECT_CONVERSATION_HISTORY, (session_id, limit), fetch="all")
+async def get_conversation_history(
+    session_id: str,
+    limit: int = 50,
+    after: Optional[Tuple[datetime, int]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Recupera histórico de conversação (ordem cronológica)
+    
+    ✅ Keyset pagination: after = (timestamp, id) da última mensagem já lida
+    """
+    if after is None:
+        return await _execute_query(
+            SQL.SELECT_CONVERSATION_HISTORY, (session_id, limit), fetch="all"
+        )
+    return await _execute_query(
+        SQL.SELECT_CONVERSATION_HISTORY_AFTER, (session_id, *after, limit), fetch="all"
+    )
 
 
 async def add_knowledge(
@@ -1207,11 +2718,7 @@ async def add_knowledge(
 ) -> int:
     """Adiciona documento à base de conhecimento"""
     row = await _execute_query(
-        """
-        INSERT INTO knowledgebase (title, content, category, source, tags, metadata)
-        VALUES (%s, %s, %s, %s, %s, %s)
-        RETURNING id
-        """,
+        SQL.INSERT_KNOWLEDGE,
         (
             title, content, category, source,
             tags or [],
@@ -1227,22 +2734,21 @@ async def search_knowledge(
     category: Optional[str] = None,
     limit: int = 10
 ) -> List[Dict[str, Any]]:
-    """Busca na base de conhecimento"""
+    """
+    Busca na base de conhecimento
+    
+    ✅ Full-text search (content_tsv + idx_kb_tsv), ordenado por relevância
+    """
     if category:
         return await _execute_query(
-            """
-            SELECT * FROM knowledgebase 
-            WHERE category = %s AND (title ILIKE %s OR content ILIKE %s)
-            ORDER BY updated_at DESC 
-            LIMIT %s
-            """,
-            (category, f"%{query}%", f"%{query}%", limit),
+            SQL.SEARCH_KNOWLEDGE_BY_CATEGORY,
+            (query, category, limit),
             fetch="all"
         )
     else:
         return await _execute_query(
             SQL.SEARCH_KNOWLEDGE_ALL,
-            (f"%{query}%", f"%{query}%", limit),
+            (query, limit),
             fetch="all"
         )
 
@@ -7,24 +7,30 @@ Features:
 - Type-safe wrappers para todas as funções async
 - Retry logic automático em operações críticas
 - Metrics tracking de operações síncronas
-- Thread-safe async execution
+- Thread-safe async execution (um event loop persistente em thread dedicada)
 - Comprehensive error handling
 - Connection pooling optimization
 
+✅ Em handlers async (FastAPI), use `await async_<nome>(...)` — também
+   importados aqui — ou maybe_await(); os wrappers recusam rodar dentro
+   de um event loop em execução
 ✅ NÃO modifica o database.py original
 ✅ Mantém compatibilidade total com FastAPI
 """
 
 import asyncio
+import inspect
 import logging
 from typing import Any, Optional, Dict, List, Callable, TypeVar, Generic
 from dataclasses import dataclass, field
 from enum import Enum
-from functools import wraps, lru_cache
-from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+from concurrent.futures import TimeoutError as FutureTimeoutError
 import time
 import threading
 
+import psycopg
+
 # ✅ Import com fallback
 try:
     from backend.database import (
@@ -32,13 +38,19 @@ try:
         set_setting as async_set_setting,
         get_all_settings as async_get_all_settings,
         log_alert as async_log_alert,
+        flush_alerts as async_flush_alerts,
         save_detection as async_save_detection,
+        save_detections_bulk as async_save_detections_bulk,
+        flush_detections as async_flush_detections,
         log_system_action as async_log_system_action,
+        settings_change_listener as async_settings_change_listener,
+        flush_system_logs as async_flush_system_logs,
         get_all_zones as async_get_all_zones,
         get_zone_by_id as async_get_zone_by_id,
         create_zone as async_create_zone,
         update_zone as async_update_zone,
         delete_zone as async_delete_zone,
+        get_pool_stats,
     )
 except ModuleNotFoundError:
     from database import (
@@ -46,15 +58,26 @@ except ModuleNotFoundError:
         set_setting as async_set_setting,
         get_all_settings as async_get_all_settings,
         log_alert as async_log_alert,
+        flush_alerts as async_flush_alerts,
         save_detection as async_save_detection,
+        save_detections_bulk as async_save_detections_bulk,
+        flush_detections as async_flush_detections,
         log_system_action as async_log_system_action,
+        settings_change_listener as async_settings_change_listener,
+        flush_system_logs as async_flush_system_logs,
         get_all_zones as async_get_all_zones,
         get_zone_by_id as async_get_zone_by_id,
         create_zone as async_create_zone,
         update_zone as async_update_zone,
         delete_zone as async_delete_zone,
+        get_pool_stats,
     )
 
+try:
+    from backend.config import settings
+except ModuleNotFoundError:
+    from config import settings
+
 logger = logging.getLogger(__name__)
 
 # Type variable for generic return types
@@ -65,13 +88,6 @@ T = TypeVar('T')
 # OTIMIZAÇÃO 1: Constants & Enums
 # ============================================
 
-class ExecutionStrategy(str, Enum):
-    """✅ Strategy for executing async code"""
-    NEW_LOOP = "new_loop"  # Create new event loop
-    THREAD_POOL = "thread_pool"  # Use thread pool executor
-    AUTO = "auto"  # Auto-detect best strategy
-
-
 class OperationType(str, Enum):
     """✅ Types of database operations"""
     READ = "read"
@@ -83,7 +99,14 @@ class OperationType(str, Enum):
 # Configuration
 DEFAULT_TIMEOUT = 30.0  # seconds
 DEFAULT_MAX_RETRIES = 2
-THREAD_POOL_MAX_WORKERS = 4
+
+# Métricas por operação (get_wrapper_stats); desligadas, os wrappers
+# não medem tempo nem tocam em _global_stats
+METRICS_ENABLED = settings.DB_SYNC_METRICS
+
+# Só falhas transitórias (conexão/timeout) valem retry; erros determinísticos
+# (UniqueViolation, ForeignKeyViolation, bugs) falhariam de novo
+RETRYABLE_ERRORS = (psycopg.OperationalError, psycopg.InterfaceError, TimeoutError)
 
 
 # ============================================
@@ -139,19 +162,28 @@ class SyncWrapperStats:
     """✅ Global statistics for all sync wrappers"""
     operations: Dict[str, OperationMetrics] = field(default_factory=dict)
     lock: threading.Lock = field(default_factory=threading.Lock)
+    # ✅ Totais agregados mantidos a cada record (get_wrapper_stats em O(1))
+    total_calls: int = 0
+    total_success: int = 0
     
     def get_or_create_metrics(self, operation: str) -> OperationMetrics:
         """Get or create metrics for an operation"""
-        with self.lock:
-            if operation not in self.operations:
-                self.operations[operation] = OperationMetrics()
-            return self.operations[operation]
+        metrics = self.operations.get(operation)
+        if metrics is None:
+            with self.lock:
+                metrics = self.operations.setdefault(operation, OperationMetrics())
+        return metrics
     
     def record(self, operation: str, success: bool, elapsed: float, retry_count: int = 0):
-        """Record operation execution"""
-        metrics = self.get_or_create_metrics(operation)
+        """Record operation execution (✅ uma única aquisição do lock por chamada)"""
         with self.lock:
+            metrics = self.operations.get(operation)
+            if metrics is None:
+                metrics = self.operations[operation] = OperationMetrics()
             metrics.record_call(success, elapsed, retry_count)
+            self.total_calls += 1
+            if success:
+                self.total_success += 1
     
     def get_summary(self) -> Dict[str, Any]:
         """Get summary of all operations"""
@@ -172,128 +204,197 @@ _global_stats = SyncWrapperStats()
 
 
 # ============================================
-# OTIMIZAÇÃO 3: Thread Pool Management
+# OTIMIZAÇÃO 3: Persistent Event Loop Thread
 # ============================================
 
-@lru_cache(maxsize=1)
-def _get_thread_pool() -> ThreadPoolExecutor:
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_thread: Optional[threading.Thread] = None
+_loop_lock = threading.Lock()
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
     """
-    ✅ Get or create thread pool executor (cached)
+    ✅ Get or start the bridge event loop (lazy, thread-safe)
+    
+    Um único loop de longa duração em thread dedicada: o pool do
+    database.py (ligado ao loop que o criou), os buffers write-behind
+    e os caches sobrevivem entre chamadas síncronas.
     
     Returns:
-        ThreadPoolExecutor instance
+        Running event loop of the bridge thread
     """
-    return ThreadPoolExecutor(
-        max_workers=THREAD_POOL_MAX_WORKERS,
-        thread_name_prefix="AsyncBridge"
-    )
+    global _loop, _loop_thread
+    
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            _loop_thread = threading.Thread(
+                target=_loop.run_forever,
+                name="AsyncBridge",
+                daemon=True
+            )
+            _loop_thread.start()
+            # Caches do bridge acompanham gravações feitas pela API
+            asyncio.run_coroutine_threadsafe(async_settings_change_listener(), _loop)
+            logger.info("[SYNC WRAPPER] 🔁 Bridge event loop started")
+        return _loop
+
 
+async def _drain_buffers() -> None:
+    """Grava o que estiver pendente nos buffers write-behind do loop"""
+    await async_flush_alerts()
+    await async_flush_detections()
+    await async_flush_system_logs()
 
-def _cleanup_thread_pool():
-    """Cleanup thread pool on exit"""
+
+def _shutdown_loop():
+    """Drain buffers and stop the bridge loop on exit"""
+    if _loop is None or _loop.is_closed():
+        return
     try:
-        pool = _get_thread_pool()
-        pool.shutdown(wait=True)
-        logger.info("[SYNC WRAPPER] 🛑 Thread pool shutdown")
+        asyncio.run_coroutine_threadsafe(_drain_buffers(), _loop).result(DEFAULT_TIMEOUT)
     except Exception as e:
-        logger.error(f"[SYNC WRAPPER] ❌ Error shutting down thread pool: {e}")
+        logger.error("[SYNC WRAPPER] ❌ Error draining buffers on exit: %s", e)
+    _loop.call_soon_threadsafe(_loop.stop)
+    if _loop_thread is not None:
+        _loop_thread.join(timeout=DEFAULT_TIMEOUT)
+    logger.info("[SYNC WRAPPER] 🛑 Bridge event loop stopped")
 
 
 # Register cleanup
 import atexit
-atexit.register(_cleanup_thread_pool)
+atexit.register(_shutdown_loop)
 
 
 # ============================================
-# OTIMIZAÇÃO 4: Async Execution Strategies
+# OTIMIZAÇÃO 4: Async Execution
 # ============================================
 
-def _detect_strategy() -> ExecutionStrategy:
+def _run_async(coro, timeout: Optional[float] = DEFAULT_TIMEOUT) -> Any:
     """
-    ✅ Auto-detect best execution strategy
+    ✅ Execute async coroutine synchronously on the bridge loop
+    
+    Args:
+        coro: Coroutine to execute
+        timeout: Optional timeout in seconds
     
     Returns:
-        ExecutionStrategy to use
+        Result of coroutine execution
+    
+    Raises:
+        TimeoutError: If execution exceeds timeout
+        RuntimeError: If called from a thread running an event loop
+            (bridge loop or FastAPI) — await the async_* variant instead
     """
     try:
-        # Check if event loop is running
         asyncio.get_running_loop()
-        return ExecutionStrategy.THREAD_POOL
     except RuntimeError:
-        return ExecutionStrategy.NEW_LOOP
-
-
-def _run_async_new_loop(coro) -> Any:
-    """
-    ✅ Execute async code by creating a new event loop
+        pass
+    else:
+        # Bloquear aqui travaria o loop do chamador (e o bridge, se for ele)
+        name = getattr(coro, "__name__", "coroutine")
+        coro.close()
+        raise RuntimeError(
+            f"sync wrapper called from a running event loop; "
+            f"use 'await async_{name}(...)' instead"
+        )
     
-    Args:
-        coro: Coroutine to execute
+    loop = _get_loop()
     
-    Returns:
-        Result of coroutine execution
-    """
-    return asyncio.run(coro)
+    future = asyncio.run_coroutine_threadsafe(coro, loop)
+    try:
+        return future.result(timeout)
+    except FutureTimeoutError:
+        future.cancel()
+        raise TimeoutError(f"Async execution timed out after {timeout}s")
+    except Exception as e:
+        logger.error("[SYNC WRAPPER] ❌ Async execution error: %s", e)
+        raise
 
 
-def _run_async_thread_pool(coro) -> Any:
+async def maybe_await(value: Any) -> Any:
     """
-    ✅ Execute async code using thread pool executor
+    ✅ Aceita o resultado de um wrapper síncrono ou uma corrotina async_*
     
-    Args:
-        coro: Coroutine to execute
-    
-    Returns:
-        Result of coroutine execution
+    Para caminhos de código compartilhados entre threads síncronas e
+    handlers async:
+        result = await maybe_await(fn(...))
     """
-    pool = _get_thread_pool()
-    future = pool.submit(asyncio.run, coro)
-    return future.result(timeout=DEFAULT_TIMEOUT)
+    if inspect.isawaitable(value):
+        return await value
+    return value
+
 
+def _log_future_error(future) -> None:
+    """Done-callback: registra falhas de corrotinas disparadas sem espera"""
+    if not future.cancelled() and future.exception() is not None:
+        logger.error("[SYNC WRAPPER] ❌ Background execution error: %s", future.exception())
 
-def _run_async(
-    coro,
-    strategy: ExecutionStrategy = ExecutionStrategy.AUTO,
-    timeout: Optional[float] = None
-) -> Any:
+
+def _submit_async(coro) -> None:
     """
-    ✅ Execute async coroutine synchronously (optimized)
-    
-    Args:
-        coro: Coroutine to execute
-        strategy: Execution strategy to use
-        timeout: Optional timeout in seconds
+    ✅ Fire-and-forget: agenda a corrotina no bridge loop sem bloquear
     
-    Returns:
-        Result of coroutine execution
-    
-    Raises:
-        TimeoutError: If execution exceeds timeout
-        RuntimeError: If execution fails
+    Para gravações cuja perda em crash é aceitável (logs de auditoria):
+    o chamador não espera o hop de thread. Erros vão para o log.
     """
-    # Auto-detect strategy if needed
-    if strategy == ExecutionStrategy.AUTO:
-        strategy = _detect_strategy()
-    
-    try:
-        if strategy == ExecutionStrategy.NEW_LOOP:
-            return _run_async_new_loop(coro)
-        elif strategy == ExecutionStrategy.THREAD_POOL:
-            return _run_async_thread_pool(coro)
-        else:
-            raise ValueError(f"Unknown strategy: {strategy}")
-    
-    except asyncio.TimeoutError:
-        raise TimeoutError(f"Async execution timed out after {timeout}s")
-    except Exception as e:
-        logger.error(f"[SYNC WRAPPER] ❌ Async execution error: {e}")
-        raise
+    loop = _get_loop()
+    if threading.current_thread() is _loop_thread:
+        loop.create_task(coro)
+        return
+    asyncio.run_coroutine_threadsafe(coro, loop).add_done_callback(_log_future_error)
 
 
 # ============================================
 # OTIMIZAÇÃO 5: Decorators for Wrappers
 # ============================================
 
+_RESULT = object()  # sentinel: devolve o resultado da corrotina
+
+
+def forward_to_async(
+    async_fn: Callable,
+    runner: Callable = _run_async,
+    returns: Any = _RESULT
+):
+    """
+    ✅ Gera o wrapper síncrono que apenas encaminha para `async_fn`
+    
+    O corpo da função decorada não é executado (fica só a assinatura e a
+    docstring). O mapeamento de argumentos é resolvido uma vez, na
+    decoração: posicionais que coincidem com os da versão async seguem
+    direto (*args, **kwargs), sem montar um dict de kwargs por chamada;
+    só os posicionais além desse prefixo comum viram keywords.
+    
+    Args:
+        async_fn: Corrotina de database.py
+        runner: _run_async (bloqueante) ou _submit_async (fire-and-forget)
+        returns: Valor fixo de retorno (ex.: True) em vez do resultado
+    """
+    def decorator(func: Callable) -> Callable:
+        sync_params = list(inspect.signature(func).parameters)
+        async_params = list(inspect.signature(async_fn).parameters)
+        
+        shared = 0
+        for sync_name, async_name in zip(sync_params, async_params):
+            if sync_name != async_name:
+                break
+            shared += 1
+        extra_names = tuple(sync_params[shared:])
+        fixed = returns is not _RESULT
+        
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if len(args) > shared:
+                kwargs.update(zip(extra_names, args[shared:]))
+                args = args[:shared]
+            result = runner(async_fn(*args, **kwargs))
+            return returns if fixed else result
+        
+        return wrapper
+    return decorator
+
+
 def sync_wrapper(
     operation_name: str,
     operation_type: OperationType = OperationType.READ,
@@ -310,29 +411,35 @@ def sync_wrapper(
         default_on_error: Default value to return on error
     
     Returns:
-        Decorated function
+        Decorated function (a própria função, sem métricas/retry/default)
     """
     def decorator(func: Callable) -> Callable:
+        # ✅ Especializado na decoração: sem nada a fazer, chamada direta
+        if not METRICS_ENABLED and max_retries == 0 and default_on_error is None:
+            return func
+        
+        track = METRICS_ENABLED
+        
         @wraps(func)
         def wrapper(*args, **kwargs):
-            start_time = time.time()
+            start_time = time.time() if track else 0.0
             last_error = None
             
             for attempt in range(max_retries + 1):
                 try:
                     result = func(*args, **kwargs)
                     
-                    elapsed = time.time() - start_time
-                    _global_stats.record(
-                        operation_name,
-                        success=True,
-                        elapsed=elapsed,
-                        retry_count=attempt
-                    )
+                    if track:
+                        _global_stats.record(
+                            operation_name,
+                            success=True,
+                            elapsed=time.time() - start_time,
+                            retry_count=attempt
+                        )
                     
                     if attempt > 0:
                         logger.info(
-                            f"[SYNC WRAPPER] ✅ {operation_name} succeeded on retry {attempt}"
+                            "[SYNC WRAPPER] ✅ %s succeeded on retry %d", operation_name, attempt
                         )
                     
                     return result
@@ -340,25 +447,26 @@ def sync_wrapper(
                 except Exception as e:
                     last_error = e
                     
-                    if attempt < max_retries:
+                    if attempt < max_retries and isinstance(e, RETRYABLE_ERRORS):
                         logger.warning(
-                            f"[SYNC WRAPPER] ⚠️ {operation_name} failed "
-                            f"(attempt {attempt + 1}/{max_retries + 1}): {e}"
+                            "[SYNC WRAPPER] ⚠️ %s failed (attempt %d/%d): %s",
+                            operation_name, attempt + 1, max_retries + 1, e
                         )
                         time.sleep(0.1 * (attempt + 1))  # Small backoff
                     else:
                         logger.error(
-                            f"[SYNC WRAPPER] ❌ {operation_name} error: {e}"
+                            "[SYNC WRAPPER] ❌ %s error: %s", operation_name, e
                         )
+                        break
             
             # All retries failed
-            elapsed = time.time() - start_time
-            _global_stats.record(
-                operation_name,
-                success=False,
-                elapsed=elapsed,
-                retry_count=max_retries
-            )
+            if track:
+                _global_stats.record(
+                    operation_name,
+                    success=False,
+                    elapsed=time.time() - start_time,
+                    retry_count=attempt
+                )
             
             if default_on_error is not None:
                 return default_on_error
@@ -374,6 +482,7 @@ def sync_wrapper(
 # ============================================
 
 @sync_wrapper("get_setting", OperationType.READ, default_on_error=None)
+@forward_to_async(async_get_setting)
 def get_setting(key: str, default: Any = None) -> Any:
     """
     ✅ Wrapper SÍNCRONO para database.get_setting()
@@ -388,10 +497,10 @@ def get_setting(key: str, default: Any = None) -> Any:
     Usage:
         conf = get_setting("conf_thresh", "0.5")
     """
-    return _run_async(async_get_setting(key, default))
 
 
 @sync_wrapper("set_setting", OperationType.WRITE, max_retries=DEFAULT_MAX_RETRIES)
+@forward_to_async(async_set_setting, returns=True)
 def set_setting(key: str, value: Any, updated_by: str = "system") -> bool:
     """
     ✅ Wrapper SÍNCRONO para database.set_setting()
@@ -407,11 +516,10 @@ def set_setting(key: str, value: Any, updated_by: str = "system") -> bool:
     Usage:
         set_setting("conf_thresh", "0.9")
     """
-    _run_async(async_set_setting(key, value, updated_by))
-    return True
 
 
 @sync_wrapper("get_all_settings", OperationType.READ, default_on_error={})
+@forward_to_async(async_get_all_settings)
 def get_all_settings() -> Dict[str, Any]:
     """
     ✅ Wrapper SÍNCRONO para database.get_all_settings()
@@ -422,7 +530,6 @@ def get_all_settings() -> Dict[str, Any]:
     Usage:
         all_settings = get_all_settings()
     """
-    return _run_async(async_get_all_settings())
 
 
 # ============================================
@@ -430,6 +537,7 @@ def get_all_settings() -> Dict[str, Any]:
 # ============================================
 
 @sync_wrapper("log_alert", OperationType.WRITE, max_retries=DEFAULT_MAX_RETRIES)
+@forward_to_async(async_log_alert, returns=True)
 def log_alert(
     person_id: int,
     out_time: float,
@@ -469,22 +577,6 @@ def log_alert(
     Usage:
         log_alert(123, 5.2, "snapshot.jpg", True, track_id=42)
     """
-    _run_async(async_log_alert(
-        person_id=person_id,
-        out_time=out_time,
-        snapshot_path=snapshot_path,
-        email_sent=email_sent,
-        track_id=track_id,
-        video_path=video_path,
-        zone_index=zone_index,
-        zone_id=zone_id,
-        zone_name=zone_name,
-        alert_type=alert_type,
-        severity=severity,
-        description=description,
-        metadata=metadata
-    ))
-    return True
 
 
 # ============================================
@@ -492,6 +584,7 @@ def log_alert(
 # ============================================
 
 @sync_wrapper("save_detection", OperationType.WRITE, max_retries=1)
+@forward_to_async(async_save_detection, returns=True)
 def save_detection(
     track_id: int,
     zone_index: Optional[int] = None,
@@ -521,24 +614,14 @@ def save_detection(
     Usage:
         save_detection(42, zone_index=0, confidence=0.95)
     """
-    _run_async(async_save_detection(
-        track_id=track_id,
-        zone_index=zone_index,
-        zone_name=zone_name,
-        confidence=confidence,
-        bbox=bbox,
-        status=status,
-        duration_seconds=duration_seconds,
-        metadata=metadata
-    ))
-    return True
 
 
 # ============================================
 # SYSTEM LOG WRAPPERS
 # ============================================
 
-@sync_wrapper("log_system_action", OperationType.WRITE, max_retries=1)
+@sync_wrapper("log_system_action", OperationType.WRITE)
+@forward_to_async(async_log_system_action, runner=_submit_async, returns=True)
 def log_system_action(
     action: str,
     username: str,
@@ -561,21 +644,15 @@ def log_system_action(
         session_id: Session ID
     
     Returns:
-        True if successful
+        True once the entry is queued
+    
+    Note:
+        Fire-and-forget: o log vai para o buffer write-behind no bridge
+        loop sem bloquear o chamador; pendências são drenadas no shutdown.
     
     Usage:
         log_system_action("zone_created", "admin", reason="New zone added")
     """
-    _run_async(async_log_system_action(
-        action=action,
-        username=username,
-        reason=reason,
-        email_sent=email_sent,
-        ip_address=ip_address,
-        context=context,
-        session_id=session_id
-    ))
-    return True
 
 
 # ============================================
@@ -583,6 +660,7 @@ def log_system_action(
 # ============================================
 
 @sync_wrapper("get_all_zones", OperationType.READ, default_on_error=[])
+@forward_to_async(async_get_all_zones)
 def get_all_zones(active_only: bool = False) -> List[Dict[str, Any]]:
     """
     ✅ Wrapper SÍNCRONO para database.get_all_zones()
@@ -596,10 +674,10 @@ def get_all_zones(active_only: bool = False) -> List[Dict[str, Any]]:
     Usage:
         zones = get_all_zones(active_only=True)
     """
-    return _run_async(async_get_all_zones(active_only))
 
 
 @sync_wrapper("get_zone_by_id", OperationType.READ, default_on_error=None)
+@forward_to_async(async_get_zone_by_id)
 def get_zone_by_id(zone_id: int) -> Optional[Dict[str, Any]]:
     """
     ✅ Wrapper SÍNCRONO para database.get_zone_by_id()
@@ -613,10 +691,10 @@ def get_zone_by_id(zone_id: int) -> Optional[Dict[str, Any]]:
     Usage:
         zone = get_zone_by_id(1)
     """
-    return _run_async(async_get_zone_by_id(zone_id))
 
 
 @sync_wrapper("create_zone", OperationType.WRITE, max_retries=DEFAULT_MAX_RETRIES)
+@forward_to_async(async_create_zone)
 def create_zone(
     name: str,
     mode: str,
@@ -645,22 +723,10 @@ def create_zone(
     Usage:
         zone_id = create_zone("Zone 1", "GENERIC", [[0,0], [100,0], [100,100], [0,100]])
     """
-    return _run_async(async_create_zone(
-        name=name,
-        mode=mode,
-        points=points,
-        max_out_time=max_out_time,
-        email_cooldown=email_cooldown,
-        empty_timeout=empty_timeout,
-        full_timeout=full_timeout,
-        empty_threshold=empty_threshold,
-        full_threshold=full_threshold,
-        enabled=enabled,
-        active=active
-    ))
 
 
 @sync_wrapper("update_zone", OperationType.UPDATE, max_retries=DEFAULT_MAX_RETRIES)
+@forward_to_async(async_update_zone)
 def update_zone(
     zone_id: int,
     name: Optional[str] = None,
@@ -688,23 +754,10 @@ def update_zone(
     Usage:
         update_zone(1, name="Updated Zone", enabled=False)
     """
-    return _run_async(async_update_zone(
-        zone_id=zone_id,
-        name=name,
-        mode=mode,
-        points=points,
-        max_out_time=max_out_time,
-        email_cooldown=email_cooldown,
-        empty_timeout=empty_timeout,
-        full_timeout=full_timeout,
-        empty_threshold=empty_threshold,
-        full_threshold=full_threshold,
-        enabled=enabled,
-        active=active
-    ))
 
 
 @sync_wrapper("delete_zone", OperationType.DELETE, max_retries=DEFAULT_MAX_RETRIES)
+@forward_to_async(async_delete_zone)
 def delete_zone(zone_id: int) -> bool:
     """
     ✅ Wrapper SÍNCRONO para database.delete_zone()
@@ -718,7 +771,6 @@ def delete_zone(zone_id: int) -> bool:
     Usage:
         delete_zone(1)
     """
-    return _run_async(async_delete_zone(zone_id))
 
 
 # ============================================
@@ -729,6 +781,8 @@ def get_wrapper_stats() -> Dict[str, Any]:
     """
     ✅ Get statistics for all sync wrappers
     
+    Só coleta com DB_SYNC_METRICS=true (caso contrário, vazio).
+    
     Returns:
         Dict with operation statistics
     
@@ -736,19 +790,16 @@ def get_wrapper_stats() -> Dict[str, Any]:
         stats = get_wrapper_stats()
         print(f"Total calls: {stats['summary']['total_calls']}")
     """
-    summary = _global_stats.get_summary()
+    stats = _global_stats
+    summary = stats.get_summary()
     
-    total_calls = sum(
-        _global_stats.operations[op].total_calls
-        for op in _global_stats.operations
-    )
-    total_success = sum(
-        _global_stats.operations[op].successful_calls
-        for op in _global_stats.operations
-    )
+    with stats.lock:
+        total_calls = stats.total_calls
+        total_success = stats.total_success
     
     return {
         "operations": summary,
+        "pool": get_pool_stats(),
         "summary": {
             "total_calls": total_calls,
             "total_success": total_success,
@@ -772,21 +823,6 @@ def reset_wrapper_stats():
     logger.info("[SYNC WRAPPER] 📊 Statistics reset")
 
 
-def set_thread_pool_workers(max_workers: int):
-    """
-    ✅ Update thread pool max workers (requires restart)
-    
-    Args:
-        max_workers: Maximum number of worker threads
-    
-    Usage:
-        set_thread_pool_workers(8)
-    """
-    global THREAD_POOL_MAX_WORKERS
-    THREAD_POOL_MAX_WORKERS = max_workers
-    logger.info(f"[SYNC WRAPPER] 🔧 Thread pool workers set to {max_workers}")
-
-
 # ============================================
 # BATCH OPERATIONS (NEW)
 # ============================================
@@ -812,6 +848,9 @@ def batch_save_detections(detections: List[Dict[str, Any]]) -> int:
     """
     ✅ Save multiple detections in batch (optimized)
     
+    Um único COPY (database.save_detections_bulk) em vez de um
+    event loop + INSERT por detecção.
+    
     Args:
         detections: List of detection dicts
     
@@ -824,15 +863,11 @@ def batch_save_detections(detections: List[Dict[str, Any]]) -> int:
             {"track_id": 2, "confidence": 0.85}
         ])
     """
-    success_count = 0
-    for detection in detections:
-        try:
-            if save_detection(**detection):
-                success_count += 1
-        except Exception as e:
-            logger.error(f"[SYNC WRAPPER] ❌ Batch detection error: {e}")
-    
-    return success_count
+    try:
+        return _run_async(async_save_detections_bulk(detections))
+    except Exception as e:
+        logger.error("[SYNC WRAPPER] ❌ Batch detection error: %s", e)
+        return 0
 
 
 # ============================================
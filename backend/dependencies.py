@@ -13,14 +13,27 @@ from typing import Optional, Dict, Any, Tuple
 from dataclasses import dataclass
 from enum import Enum
 from functools import lru_cache
+import asyncio
+import hashlib
+import hmac
+import secrets
+import threading
+import time
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import JWTError, jwt
+from jose import JWTError, jwk, jwt
+from jose.backends.base import Key
 from passlib.context import CryptContext
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 import logging
 
+try:
+    import argon2  # noqa: F401  (backend do passlib para argon2id)
+    ARGON2_AVAILABLE = True
+except ImportError:
+    ARGON2_AVAILABLE = False
+
 
 from backend.config import settings
 from backend import database
@@ -80,6 +93,20 @@ class TokenPayload:
 PASSWORD_MIN_LENGTH = 8
 PASSWORD_MAX_LENGTH = 72  # bcrypt limit
 
+# Cache de verificações bcrypt bem-sucedidas
+VERIFY_CACHE_MAX_ENTRIES = 1024
+
+# Cache de tokens JWT já validados (nunca além do exp do token)
+TOKEN_CACHE_TTL = 60.0  # seconds
+TOKEN_CACHE_MAX_ENTRIES = 4096
+
+# Lista de algoritmos aceitos no decode (montada uma vez)
+JWT_ALGORITHMS = [settings.ALGORITHM]
+
+# Authorization: Bearer <token>
+BEARER_PREFIX = "Bearer "
+BEARER_PREFIX_LEN = len(BEARER_PREFIX)
+
 
 
 # ============================================
@@ -92,8 +119,52 @@ def _get_pwd_context() -> CryptContext:
     """
     ✅ Cached CryptContext (expensive to create)
     Creates only once and reuses
+    
+    Novos hashes usam settings.PASSWORD_HASH_SCHEME (argon2id por padrão,
+    custo em settings.ARGON2_*); hashes bcrypt existentes continuam
+    verificando, pois o passlib identifica o esquema pelo prefixo do hash,
+    e são migrados no login (password_needs_rehash).
+    """
+    default = settings.PASSWORD_HASH_SCHEME
+    if default == "argon2" and not ARGON2_AVAILABLE:
+        logger.warning("⚠️ argon2-cffi não instalado, usando bcrypt para novos hashes")
+        default = "bcrypt"
+    
+    options: Dict[str, Any] = {"bcrypt__rounds": settings.BCRYPT_ROUNDS}
+    schemes = ["bcrypt"]
+    if ARGON2_AVAILABLE:
+        schemes.insert(0, "argon2")
+        options.update(
+            argon2__type="ID",
+            argon2__time_cost=settings.ARGON2_TIME_COST,
+            argon2__memory_cost=settings.ARGON2_MEMORY_COST,
+            argon2__parallelism=settings.ARGON2_PARALLELISM,
+        )
+    
+    return CryptContext(schemes=schemes, default=default, deprecated="auto", **options)
+
+
+
+@lru_cache(maxsize=1)
+def _get_jwt_key() -> Key:
     """
-    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+    ✅ Cached JWT signing key
+    
+    Passando um Key pronto, o python-jose não refaz a cada encode/decode
+    a tentativa de json.loads da chave nem o jwk.construct/encode dela.
+    """
+    return jwk.construct(settings.SECRET_KEY, settings.ALGORITHM)
+
+
+
+# Chave por processo: o cache guarda HMAC da senha, nunca um hash rápido reutilizável
+_VERIFY_CACHE_KEY = secrets.token_bytes(32)
+# LRU: ordem de inserção do dict = ordem de uso (acerto re-insere no fim)
+_verified_passwords: Dict[Tuple[bytes, str], None] = {}
+# verify_password roda em worker threads (verify_password_async)
+_verified_passwords_lock = threading.Lock()
+
+_token_cache: Dict[str, Tuple[TokenPayload, float]] = {}
 
 
 
@@ -155,24 +226,45 @@ def _create_jwt_payload(username: str, expires_delta: Optional[timedelta] = None
         expires_delta: Optional custom expiration time
     
     Returns:
-        JWT payload dictionary
+        JWT payload dictionary (exp/iat em epoch inteiro, formato do JWT)
     """
+    now = int(time.time())
     if expires_delta:
-        expire = datetime.now(timezone.utc) + expires_delta
+        lifetime = int(expires_delta.total_seconds())
     else:
-        expire = datetime.now(timezone.utc) + timedelta(
-            minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
-        )
+        lifetime = settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
     
     return {
         "sub": username,
-        "exp": expire,
+        "exp": now + lifetime,
         "token_type": TokenType.ACCESS,
-        "iat": datetime.now(timezone.utc)  # issued at
+        "iat": now  # issued at
     }
 
 
 
+def _get_cached_token(token: str) -> Optional[TokenPayload]:
+    """✅ Payload de um token validado recentemente (None se ausente/expirado)"""
+    entry = _token_cache.get(token)
+    if entry is None:
+        return None
+    payload, expires_at = entry
+    if expires_at > time.time():
+        return payload
+    _token_cache.pop(token, None)
+    return None
+
+
+
+def _cache_token(token: str, payload: TokenPayload) -> None:
+    """✅ Guarda o payload até min(TOKEN_CACHE_TTL, exp do token)"""
+    expires_at = min(time.time() + TOKEN_CACHE_TTL, payload.exp.timestamp())
+    if len(_token_cache) >= TOKEN_CACHE_MAX_ENTRIES:
+        _token_cache.pop(next(iter(_token_cache)), None)
+    _token_cache[token] = (payload, expires_at)
+
+
+
 def _create_http_exception(
     status_code: int,
     detail: str,
@@ -197,6 +289,13 @@ def _create_http_exception(
 
 
 
+# ✅ Header fixo do 401 (montado uma vez). As HTTPException em si são
+# criadas a cada raise: uma instância compartilhada entre requests
+# concorrentes misturaria __traceback__/__context__ entre elas.
+_BEARER_CHALLENGE = {"WWW-Authenticate": "Bearer"}
+
+
+
 # ============================================
 # PASSWORD HASHING
 # ============================================
@@ -208,14 +307,33 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     
     Args:
         plain_password: Senha em texto plano
-        hashed_password: Hash bcrypt da senha
+        hashed_password: Hash da senha (argon2id ou bcrypt)
     
     Returns:
         True se senha correta, False caso contrário
     """
     try:
         normalized = _normalize_password(plain_password)
-        return _get_pwd_context().verify(normalized, hashed_password)
+        
+        # ✅ Acerto no cache evita o bcrypt (~100 ms); só sucessos são cacheados
+        digest = hmac.new(_VERIFY_CACHE_KEY, normalized.encode('utf-8'), hashlib.sha256).digest()
+        cache_key = (digest, hashed_password)
+        with _verified_passwords_lock:
+            if cache_key in _verified_passwords:
+                # Move para o fim: a eviction descarta o menos usado, não o mais antigo
+                _verified_passwords[cache_key] = _verified_passwords.pop(cache_key)
+                return True
+        
+        # Hash fora do lock: verificações concorrentes rodam em paralelo
+        if not _get_pwd_context().verify(normalized, hashed_password):
+            return False
+        
+        with _verified_passwords_lock:
+            _verified_passwords.pop(cache_key, None)
+            if len(_verified_passwords) >= VERIFY_CACHE_MAX_ENTRIES:
+                _verified_passwords.pop(next(iter(_verified_passwords)), None)
+            _verified_passwords[cache_key] = None
+        return True
     except Exception as e:
         logger.error(f"Password verification error: {e}")
         return False
@@ -230,7 +348,7 @@ def get_password_hash(password: str) -> str:
         password: Senha em texto plano
     
     Returns:
-        Hash bcrypt da senha
+        Hash da senha (esquema padrão do CryptContext)
     
     Raises:
         ValueError: Se senha não atende requisitos
@@ -245,6 +363,45 @@ def get_password_hash(password: str) -> str:
 
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    ✅ verify_password fora do event loop (argon2/bcrypt é CPU-bound)
+    
+    O hash roda em uma worker thread (asyncio.to_thread), então outras
+    requests continuam sendo atendidas durante o login.
+    """
+    return await asyncio.to_thread(verify_password, plain_password, hashed_password)
+
+
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    ✅ get_password_hash fora do event loop (mesmas exceções)
+    
+    Raises:
+        ValueError: Se senha não atende requisitos
+    """
+    return await asyncio.to_thread(get_password_hash, password)
+
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """
+    ✅ Hash em esquema/custo antigo (bcrypt, parâmetros argon2 menores)?
+    
+    Args:
+        hashed_password: Hash armazenado
+    
+    Returns:
+        True se deve ser regravado com o esquema/custo atual
+    """
+    try:
+        return _get_pwd_context().needs_update(hashed_password)
+    except Exception:
+        return False
+
+
+
 # ============================================
 # JWT TOKEN
 # ============================================
@@ -283,7 +440,7 @@ def create_access_token(
     try:
         encoded_jwt = jwt.encode(
             payload,
-            settings.SECRET_KEY,
+            _get_jwt_key(),
             algorithm=settings.ALGORITHM
         )
         return encoded_jwt
@@ -303,13 +460,19 @@ def decode_access_token(token: str) -> Optional[TokenPayload]:
     Returns:
         TokenPayload se válido, None se inválido
     """
+    cached = _get_cached_token(token)
+    if cached is not None:
+        return cached
+    
     try:
-        payload = jwt.decode(
+        payload = TokenPayload.from_dict(jwt.decode(
             token,
-            settings.SECRET_KEY,
-            algorithms=[settings.ALGORITHM]
-        )
-        return TokenPayload.from_dict(payload)
+            _get_jwt_key(),
+            algorithms=JWT_ALGORITHMS
+        ))
+        if payload is not None:
+            _cache_token(token, payload)
+        return payload
     except jwt.ExpiredSignatureError:
         logger.warning("Token has expired")
         return None
@@ -332,11 +495,16 @@ def validate_token(token: str) -> Tuple[bool, Optional[str], Optional[TokenPaylo
     if not token:
         return False, AuthError.INVALID_TOKEN, None
     
+    # ✅ Token já validado: sem HMAC + parse JSON por request
+    cached = _get_cached_token(token)
+    if cached is not None:
+        return True, None, cached
+    
     try:
         payload_dict = jwt.decode(
             token,
-            settings.SECRET_KEY,
-            algorithms=[settings.ALGORITHM]
+            _get_jwt_key(),
+            algorithms=JWT_ALGORITHMS
         )
         
         payload = TokenPayload.from_dict(payload_dict)
@@ -347,6 +515,7 @@ def validate_token(token: str) -> Tuple[bool, Optional[str], Optional[TokenPaylo
         if payload.exp < datetime.now(timezone.utc):
             return False, AuthError.EXPIRED_TOKEN, None
         
+        _cache_token(token, payload)
         return True, None, payload
         
     except jwt.ExpiredSignatureError:
@@ -362,13 +531,50 @@ def validate_token(token: str) -> Tuple[bool, Optional[str], Optional[TokenPaylo
 # ============================================
 
 
+async def _resolve_user(
+    request: Request,
+    token: str
+) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """
+    ✅ Token -> usuário, memoizado em request.state
+    
+    get_current_user e get_optional_current_user compartilham o resultado:
+    numa mesma request o JWT é validado e o usuário buscado uma única vez.
+    
+    Returns:
+        Tuple of (user or None, error_message)
+    """
+    cached = getattr(request.state, "_auth_user", None)
+    if cached is not None and cached[0] == token:
+        return cached[1], cached[2]
+    
+    is_valid, error_msg, payload = validate_token(token)
+    if not is_valid or payload is None:
+        user = None
+        error_msg = error_msg or AuthError.INVALID_CREDENTIALS
+    else:
+        # Busca usuário ativo no banco (partial index idx_users_active_username)
+        user = await database.get_active_user_by_username(payload.sub)
+        if user is None:
+            # Conta existente mas inativa: get_current_active_user responde 400
+            user = await database.get_user_by_username(payload.sub)
+        if user is None:
+            error_msg = AuthError.USER_NOT_FOUND
+    
+    request.state._auth_user = (token, user, error_msg)
+    return user, error_msg
+
+
+
 async def get_current_user(
+    request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> Dict[str, Any]:
     """
     Dependency: Obtém usuário atual do token JWT
     
     Args:
+        request: FastAPI request object
         credentials: HTTP Bearer credentials
     
     Raises:
@@ -377,23 +583,12 @@ async def get_current_user(
     Returns:
         Dados do usuário
     """
-    token = credentials.credentials
-    is_valid, error_msg, payload = validate_token(token)
-    
-    if not is_valid or payload is None:
-        raise _create_http_exception(
-            status.HTTP_401_UNAUTHORIZED,
-            error_msg or AuthError.INVALID_CREDENTIALS,
-            {"WWW-Authenticate": "Bearer"}
-        )
-    
-    # Busca usuário no banco
-    user = await database.get_user_by_username(payload.sub)
+    user, error_msg = await _resolve_user(request, credentials.credentials)
     if user is None:
         raise _create_http_exception(
             status.HTTP_401_UNAUTHORIZED,
-            AuthError.USER_NOT_FOUND,
-            {"WWW-Authenticate": "Bearer"}
+            error_msg,
+            _BEARER_CHALLENGE
         )
     
     return user
@@ -415,8 +610,8 @@ async def get_current_active_user(
     Returns:
         Dados do usuário ativo
     """
-    # Check if user is disabled (if your User model has this field)
-    if current_user.get("disabled", False):
+    # Mesmo critério de get_active_user_by_username (is_active AND NOT disabled)
+    if current_user.get("disabled", False) or not current_user.get("is_active", True):
         raise _create_http_exception(
             status.HTTP_400_BAD_REQUEST,
             AuthError.INACTIVE_USER
@@ -478,10 +673,22 @@ async def authenticate_user(username: str, password: str) -> Optional[Dict[str,
         return None
     
     # Verify password
-    if not verify_password(password, user["password_hash"]):
+    if not await verify_password_async(password, user["password_hash"]):
         logger.info(f"Login attempt failed: invalid password ({username})")
         return None
     
+    # ✅ Migração oportunista: regrava hash legado (bcrypt/custo antigo)
+    # com a senha em mãos; sem checagem de força, a senha já é a atual
+    if password_needs_rehash(user["password_hash"]):
+        try:
+            new_hash = await asyncio.to_thread(
+                _get_pwd_context().hash, _normalize_password(password)
+            )
+            if await database.update_user(user["id"], password_hash=new_hash):
+                user["password_hash"] = new_hash
+        except Exception as e:
+            logger.error(f"Failed to rehash password for {username}: {e}")
+    
     # Update last login timestamp
     try:
         await database.update_last_login(username)
@@ -513,18 +720,13 @@ async def get_optional_current_user(request: Request) -> Optional[Dict[str, Any]
     try:
         # Extract token from header
         auth_header = request.headers.get("Authorization")
-        if not auth_header or not auth_header.startswith("Bearer "):
+        if not auth_header or not auth_header.startswith(BEARER_PREFIX):
             return None
         
-        token = auth_header.replace("Bearer ", "")
-        
-        # Validate token
-        is_valid, _, payload = validate_token(token)
-        if not is_valid or payload is None:
-            return None
+        token = auth_header[BEARER_PREFIX_LEN:]
         
-        # Fetch user
-        user = await database.get_user_by_username(payload.sub)
+        # Validate token + fetch user (compartilhado com get_current_user)
+        user, _ = await _resolve_user(request, token)
         return user
     
     except Exception as e:
@@ -541,10 +743,16 @@ async def get_optional_current_user(request: Request) -> Optional[Dict[str, Any]
 # ✅ CORREÇÃO: Não carregar .env via SlowAPI
 # O Pydantic já faz isso corretamente em config.py
 # Isso evita erro de encoding com emojis no .env
+# ✅ Storage configurável: memory:// é por processo (cada worker do uvicorn
+# tem seus próprios contadores); com Redis o limite vale para todos.
+# Se o Redis cair, cai para memória em vez de responder 500.
 limiter = Limiter(
     key_func=get_remote_address,
     config_filename=None,  # ✅ Ignora .env (evita UnicodeDecodeError)
-    default_limits=["100/minute"]
+    default_limits=["100/minute"],
+    storage_uri=settings.RATE_LIMIT_STORAGE_URI,
+    strategy=settings.RATE_LIMIT_STRATEGY,
+    in_memory_fallback_enabled=not settings.RATE_LIMIT_STORAGE_URI.startswith("memory://")
 )
 
 
@@ -589,6 +797,20 @@ def hash_password_safe(password: str) -> Optional[str]:
 
 
 
+async def hash_password_safe_async(password: str) -> Optional[str]:
+    """
+    ✅ hash_password_safe fora do event loop
+    
+    Args:
+        password: Plain text password
+    
+    Returns:
+        Password hash or None if validation failed
+    """
+    return await asyncio.to_thread(hash_password_safe, password)
+
+
+
 # ============================================
 # TEST SCRIPT
 # ============================================
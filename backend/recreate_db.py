@@ -184,7 +184,7 @@ async def _backup_users() -> List[Dict[str, Any]]:
         List of user records
     """
     try:
-        users = await get_all_users()
+        users = await get_all_users(include_credentials=True)
         logger.info(f"   📦 Backed up {len(users)} users")
         return users
     except Exception as e:
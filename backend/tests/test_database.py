@@ -0,0 +1,279 @@
+"""
+Testes de backend/database.py sem PostgreSQL (buffers e caches em memória)
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+
+import pytest
+
+from backend import database
+
+
+@pytest.fixture
+def written(monkeypatch) -> Dict[str, List[Tuple]]:
+    """Substitui a gravação dos buffers write-behind por uma lista por buffer"""
+    rows: Dict[str, List[Tuple]] = {}
+    for buffer in (database._alert_buffer, database._detection_buffer, database._system_log_buffer):
+        async def fake_write_batch(batch: List[Tuple], name: str = buffer.name) -> None:
+            rows.setdefault(name, []).extend(batch)
+        monkeypatch.setattr(buffer, "write_batch", fake_write_batch)
+    return rows
+
+
+# ============================================
+# WRITE-BEHIND BUFFERS
+# ============================================
+
+def test_close_db_pool_flushes_write_behind_buffers(monkeypatch, written):
+    class _FakePool:
+        closed = False
+
+        async def close(self) -> None:
+            self.closed = True
+
+    fake_pool = _FakePool()
+    monkeypatch.setattr(database, "pool", fake_pool)
+
+    async def scenario() -> None:
+        await database.log_system_action("login", "alice")
+        await database.log_alert(person_id=1, out_time=2.5)
+        await database.save_detection(track_id=7)
+        await database.close_db_pool()
+
+    asyncio.run(scenario())
+
+    assert fake_pool.closed
+    assert len(written["systemlogs"]) == 1
+    assert len(written["alerts"]) == 1
+    assert len(written["detections"]) == 1
+
+
+def test_api_modules_share_backend_database():
+    """Uma única instância do módulo: invalidação e flush atingem o que a API usa"""
+    import sys
+    from backend.api import admin, auth, settings, users, zones
+
+    for module in (admin, auth, settings, users):
+        assert module.database is database
+    assert zones.schedule_zone_sync is database.schedule_zone_sync
+    assert "database" not in sys.modules
+
+
+def test_write_behind_buffer_serves_each_event_loop(written):
+    """Uso a partir de um segundo loop não perde as linhas de nenhum dos dois"""
+    buffer = database._system_log_buffer
+
+    async def enqueue_and_flush(action: str) -> None:
+        await database.log_system_action(action, "alice")
+        await buffer.flush()
+
+    asyncio.run(enqueue_and_flush("first"))
+    asyncio.run(enqueue_and_flush("second"))
+
+    assert [row[0] for row in written["systemlogs"]] == ["first", "second"]
+
+
+def test_write_behind_buffer_isolates_concurrent_loops(written):
+    """Dois loops vivos ao mesmo tempo (API + bridge) têm filas separadas"""
+    buffer = database._detection_buffer
+    loop_a, loop_b = asyncio.new_event_loop(), asyncio.new_event_loop()
+    try:
+        loop_a.run_until_complete(database.save_detection(track_id=1))
+        loop_b.run_until_complete(database.save_detection(track_id=2))
+        loop_a.run_until_complete(buffer.flush())
+        loop_b.run_until_complete(buffer.flush())
+    finally:
+        loop_a.close()
+        loop_b.close()
+
+    assert sorted(row[0] for row in written["detections"]) == [1, 2]
+
+
+# ============================================
+# USER CACHE
+# ============================================
+
+def _user(user_id: int = 1, username: str = "alice", **fields) -> Dict[str, Any]:
+    row = {"id": user_id, "username": username, "password_hash": "old", "role": "user", "is_active": True}
+    row.update(fields)
+    return row
+
+
+def test_user_cache_invalidation_by_id_and_username():
+    cache = database._UserCache()
+    db = {"alice": _user()}
+    loads: List[str] = []
+
+    async def loader() -> Optional[Dict[str, Any]]:
+        loads.append("alice")
+        row = db.get("alice")
+        return dict(row) if row else None
+
+    async def scenario() -> None:
+        assert (await cache.get("username", "alice", loader))["password_hash"] == "old"
+        assert (await cache.get("username", "alice", loader))["password_hash"] == "old"
+        assert len(loads) == 1
+
+        db["alice"]["password_hash"] = "new"
+        cache.invalidate(user_id=1)
+        assert (await cache.get("username", "alice", loader))["password_hash"] == "new"
+
+        del db["alice"]
+        cache.invalidate(username="alice")
+        assert await cache.get("username", "alice", loader) is None
+
+    asyncio.run(scenario())
+
+
+def test_user_cache_returns_copies():
+    cache = database._UserCache()
+
+    async def loader() -> Dict[str, Any]:
+        return _user()
+
+    async def scenario() -> None:
+        first = await cache.get("id", 1, loader)
+        first["role"] = "admin"
+        assert (await cache.get("id", 1, loader))["role"] == "user"
+
+    asyncio.run(scenario())
+
+
+async def _settle() -> None:
+    """Deixa as tasks criadas rodarem até o próximo ponto de espera"""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_user_cache_single_flight_and_invalidation_during_load():
+    cache = database._UserCache()
+    loads = 0
+    release = None
+
+    async def loader() -> Dict[str, Any]:
+        nonlocal loads
+        loads += 1
+        role = "user" if loads == 1 else "admin"
+        await release.wait()
+        return _user(role=role)
+
+    async def scenario() -> None:
+        nonlocal release
+        release = asyncio.Event()
+        waiters = [asyncio.create_task(cache.get("username", "alice", loader)) for _ in range(10)]
+        await _settle()
+        assert loads == 1
+
+        # Mutação durante o load: quem chega depois não reaproveita a leitura antiga
+        cache.invalidate(username="alice")
+        late = asyncio.create_task(cache.get("username", "alice", loader))
+        await _settle()
+        release.set()
+
+        rows = await asyncio.gather(*waiters)
+        assert {row["role"] for row in rows} == {"user"}
+        assert (await late)["role"] == "admin"
+        assert loads == 2
+
+    asyncio.run(scenario())
+
+
+# ============================================
+# SETTINGS LISTENER
+# ============================================
+
+def test_settings_notify_invalidates_cache_read_by_api(monkeypatch):
+    """NOTIFY settings_changed descarta a chave no cache que a API de settings lê"""
+    from types import SimpleNamespace
+    from backend.api import settings as settings_api
+
+    class _StopListening(Exception):
+        pass
+
+    class _FakeListenConnection:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc_info):
+            return False
+
+        async def execute(self, query):
+            return None
+
+        async def notifies(self):
+            # Cache populado depois do LISTEN: só a notificação pode descartá-lo
+            assert await settings_api.database._read_cache.get(cache_key, loader) == "1"
+            yield SimpleNamespace(channel=database.SETTINGS_NOTIFY_CHANNEL, payload="conf_thresh")
+
+    connects = []
+
+    async def fake_connect(*args, **kwargs):
+        connects.append(args)
+        if len(connects) > 1:
+            raise _StopListening()
+        return _FakeListenConnection()
+
+    monkeypatch.setattr(database.psycopg.AsyncConnection, "connect", fake_connect)
+    loads = []
+    cache_key = database._setting_cache_key("conf_thresh")
+
+    async def loader():
+        loads.append(cache_key)
+        return str(len(loads))
+
+    async def scenario() -> None:
+        cache = settings_api.database._read_cache
+        cache.invalidate()
+
+        with pytest.raises(_StopListening):
+            await database.settings_change_listener()
+
+        assert await cache.get(cache_key, loader) == "2"
+
+    asyncio.run(scenario())
+
+
+# ============================================
+# LAST LOGIN
+# ============================================
+
+def test_flush_last_logins_prunes_expired_throttle_entries(monkeypatch):
+    """Só usuários dentro da janela de throttle continuam em memória"""
+    queries = []
+
+    async def fake_execute_query(query, params=None, fetch=None):
+        queries.append(params)
+
+    monkeypatch.setattr(database, "_execute_query", fake_execute_query)
+    monkeypatch.setattr(database, "_pending_logins", {})
+    stale = database.time.time() - database.LAST_LOGIN_MIN_INTERVAL - 1
+    monkeypatch.setattr(
+        database, "_last_login_recorded", {f"old-{i}": stale for i in range(100)}
+    )
+
+    async def scenario() -> None:
+        await database.update_last_login("alice")
+        await database.flush_last_logins()
+
+    asyncio.run(scenario())
+
+    assert list(database._last_login_recorded) == ["alice"]
+    assert queries == [(["alice"], [database._last_login_recorded["alice"]])]
+
+
+# ============================================
+# ZONES
+# ============================================
+
+def test_delete_zone_reports_missing_zone(monkeypatch):
+    """RETURNING vazio (id inexistente) não conta como deleção"""
+    async def fake_execute_query(query, params=None, fetch=None):
+        return {"id": params[0]} if params[0] == 1 else None
+
+    monkeypatch.setattr(database, "_execute_query", fake_execute_query)
+
+    async def scenario() -> Tuple[bool, bool]:
+        return await database.delete_zone(1), await database.delete_zone(999, soft=False)
+
+    assert asyncio.run(scenario()) == (True, False)
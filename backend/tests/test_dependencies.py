@@ -0,0 +1,149 @@
+"""
+Testes de backend/dependencies.py (auth)
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from backend import database, dependencies
+
+
+def _make_user(username: str = "alice", **overrides) -> Dict[str, Any]:
+    user = {"id": 1, "username": username, "role": "user", "is_active": True, "disabled": False}
+    user.update(overrides)
+    return user
+
+
+def test_resolve_user_is_memoized_per_request(monkeypatch):
+    """Duas dependencies de auth na mesma request: 1 decode + 1 lookup"""
+    lookups = []
+
+    async def fake_lookup(username: str) -> Optional[Dict[str, Any]]:
+        lookups.append(username)
+        return _make_user(username)
+
+    monkeypatch.setattr(database, "get_active_user_by_username", fake_lookup)
+    monkeypatch.setattr(database, "get_user_by_username", fake_lookup)
+
+    app = FastAPI()
+
+    @app.get("/both")
+    async def both(
+        user: Dict[str, Any] = Depends(dependencies.get_current_user),
+        optional: Optional[Dict[str, Any]] = Depends(dependencies.get_optional_current_user),
+    ):
+        return {"user": user["username"], "optional": optional and optional["username"]}
+
+    token = dependencies.create_access_token({"sub": "alice"})
+    response = TestClient(app).get("/both", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 200
+    assert response.json() == {"user": "alice", "optional": "alice"}
+    assert lookups == ["alice"]
+
+
+def test_verify_password_concurrent_cache_eviction(monkeypatch):
+    """Threads concorrentes enchendo/evictando o cache nunca rejeitam senha certa"""
+    class _FastContext:
+        def verify(self, secret: str, hashed: str) -> bool:
+            return hashed == f"hash:{secret}"
+
+    monkeypatch.setattr(dependencies, "_get_pwd_context", lambda: _FastContext())
+    monkeypatch.setattr(dependencies, "VERIFY_CACHE_MAX_ENTRIES", 8)
+    monkeypatch.setattr(dependencies, "_verified_passwords", {})
+
+    passwords = [f"password-{i}" for i in range(4000)]
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(lambda p: dependencies.verify_password(p, f"hash:{p}"), passwords))
+
+    assert all(results)
+    assert len(dependencies._verified_passwords) <= 8
+    assert dependencies.verify_password("password-1", "hash:wrong") is False
+
+
+def test_auth_errors_raise_a_fresh_exception_per_request():
+    """Nada de instância compartilhada: __traceback__/__context__ são por request"""
+    async def raise_forbidden() -> HTTPException:
+        try:
+            await dependencies.get_current_admin_user(_make_user(role="user"))
+        except HTTPException as exc:
+            return exc
+        raise AssertionError("expected HTTPException")
+
+    async def scenario():
+        return await raise_forbidden(), await raise_forbidden()
+
+    first, second = asyncio.run(scenario())
+    assert first is not second
+    assert first.status_code == second.status_code == 403
+    assert first.detail == dependencies.AuthError.INSUFFICIENT_PERMISSIONS
+
+
+def test_disabled_user_gets_inactive_error_not_user_not_found(monkeypatch):
+    """Conta desativada com token válido: 400 Inactive user (não 401)"""
+    async def no_active_user(username: str) -> None:
+        return None
+
+    async def disabled_user(username: str) -> Dict[str, Any]:
+        return _make_user(username, disabled=True, is_active=False)
+
+    monkeypatch.setattr(database, "get_active_user_by_username", no_active_user)
+    monkeypatch.setattr(database, "get_user_by_username", disabled_user)
+
+    app = FastAPI()
+
+    @app.get("/me")
+    async def me(user: Dict[str, Any] = Depends(dependencies.get_current_active_user)):
+        return {"user": user["username"]}
+
+    token = dependencies.create_access_token({"sub": "bob"})
+    response = TestClient(app).get("/me", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == dependencies.AuthError.INACTIVE_USER
+
+
+def test_unknown_user_gets_user_not_found(monkeypatch):
+    async def missing(username: str) -> None:
+        return None
+
+    monkeypatch.setattr(database, "get_active_user_by_username", missing)
+    monkeypatch.setattr(database, "get_user_by_username", missing)
+
+    app = FastAPI()
+
+    @app.get("/me")
+    async def me(user: Dict[str, Any] = Depends(dependencies.get_current_active_user)):
+        return {"user": user["username"]}
+
+    token = dependencies.create_access_token({"sub": "ghost"})
+    response = TestClient(app).get("/me", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 401
+    assert response.json()["detail"] == dependencies.AuthError.USER_NOT_FOUND
+
+
+def test_verify_password_cache_evicts_least_recently_used(monkeypatch):
+    """Usuário que faz login com frequência não perde a entrada para logins únicos"""
+    verifications = []
+
+    class _CountingContext:
+        def verify(self, secret: str, hashed: str) -> bool:
+            verifications.append(secret)
+            return hashed == f"hash:{secret}"
+
+    monkeypatch.setattr(dependencies, "_get_pwd_context", lambda: _CountingContext())
+    monkeypatch.setattr(dependencies, "VERIFY_CACHE_MAX_ENTRIES", 4)
+    monkeypatch.setattr(dependencies, "_verified_passwords", {})
+
+    assert dependencies.verify_password("hot-password", "hash:hot-password")
+    for i in range(10):
+        assert dependencies.verify_password(f"one-off-{i}", f"hash:one-off-{i}")
+        assert dependencies.verify_password("hot-password", "hash:hot-password")
+
+    assert verifications.count("hot-password") == 1
+    assert len(dependencies._verified_passwords) <= 4